@@ -6,25 +6,301 @@ Database interactions for result storage/retrieval
 
 from __future__ import annotations
 from typing import Any
+from typing import Iterator
+from contextlib import contextmanager
+import io
+import itertools
 import os
+import queue
+import re
 import sqlite3
 import pickle
 import gzip
+import json
 import pandas as pd
+import pyarrow as pa
+import zstandard
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compression contexts are reused across calls to avoid the per-call
+# setup cost.
+_ZSTD_C = zstandard.ZstdCompressor(level=3)
+_ZSTD_D = zstandard.ZstdDecompressor()
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_GZIP_MAGIC = b'\x1f\x8b'
+# Value of the `format` column. Dataframes are only written as Arrow
+# streams; rows with another format (or a NULL format, written before
+# that column existed) are pickled dataframes, which are still read.
+_FORMAT_ARROW = 'arrow_zstd'
+# Schema metadata key marking a stored pandas.Series, holding its name.
+_SERIES_KEY = b'series_name'
+
+# Number of identifiers bound per query, below SQLite's default
+# SQLITE_MAX_VARIABLE_NUMBER of 999.
+_MAX_SQL_PARAMS = 900
+
+_INSERT_RECORD = '''
+    INSERT INTO results_table
+    (id, chunk_id, data, metadata, metadata_json, log, format)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Open connections, keyed on (db_path, process id, wal, temp_dir) so
+# that they are never used by a forked child process that inherited
+# the pool, and only shared by handlers with the same connection
+# settings. DB_Handler is not thread-safe: the pool, the shared
+# compression contexts and the connections must all be used from a
+# single thread per process (SQLite raises if a connection is used
+# from another thread).
+_POOL: dict[tuple[str, int, bool, str | None], queue.LifoQueue] = {}
+
+
+def _dumps_json(obj: Any) -> str:
+    """
+    Serialize metadata to JSON, using orjson if it is available.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to be serialized.
+
+    Returns
+    -------
+    str
+        The JSON text.
+
+    Raises
+    ------
+    TypeError
+        If the object is not JSON serializable.
+    """
+    if orjson is not None:
+        # (orjson.JSONEncodeError is a TypeError)
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+def _loads_json(text: str) -> Any:
+    """
+    Deserialize JSON metadata, using orjson if it is available.
+
+    Parameters
+    ----------
+    text : str
+        The JSON text.
+
+    Returns
+    -------
+    Any
+        The deserialized object.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _compress(data: bytes) -> bytes:
+    """
+    Compress bytes with zstd.
+
+    Parameters
+    ----------
+    data : bytes
+        The bytes to be compressed.
+
+    Returns
+    -------
+    bytes
+        The compressed bytes.
+    """
+    return _ZSTD_C.compress(data)
+
+
+def _decompress(data: bytes) -> bytes:
+    """
+    Decompress bytes, detecting the codec from the magic bytes so
+    that rows written with gzip by earlier versions can still be
+    read.
+
+    Parameters
+    ----------
+    data : bytes
+        The compressed bytes.
+
+    Returns
+    -------
+    bytes
+        The decompressed bytes.
+    """
+    if data[:4] == _ZSTD_MAGIC:
+        return _ZSTD_D.decompress(data)
+    if data[:2] == _GZIP_MAGIC:
+        return gzip.decompress(data)
+    raise ValueError('Unrecognized compression format.')
+
+
+class _ChunkReader(io.RawIOBase):
+    """
+    Read-only file-like object over an iterator of BLOB chunks, used
+    to decode a record without joining its chunks first.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        """
+        Constructor for _ChunkReader.
+
+        Parameters
+        ----------
+        chunks : iterator of bytes
+            The chunks, in order.
+        """
+        super().__init__()
+        self._chunks = chunks
+        self._view = memoryview(b'')
+
+    def readable(self) -> bool:
+        """
+        Whether the stream supports reading.
+
+        Returns
+        -------
+        bool
+            Always True.
+        """
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Read bytes into a pre-allocated buffer, moving to the next
+        chunk when the current one is exhausted.
+
+        Parameters
+        ----------
+        buffer : writable bytes-like object
+            The buffer to be filled.
+
+        Returns
+        -------
+        int
+            Number of bytes read, or 0 at the end of the chunks.
+        """
+        while not self._view:
+            try:
+                self._view = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        num = min(len(buffer), len(self._view))
+        buffer[:num] = self._view[:num]
+        self._view = self._view[num:]
+        return num
+
+
+def _loads_dataframe(stream: io.BufferedReader) -> Any:
+    """
+    Decompress and deserialize a pickled dataframe. Dataframes are no
+    longer written in this format, but older records are still read.
+
+    Parameters
+    ----------
+    stream : io.BufferedReader
+        Stream over the serialized dataframe.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The deserialized dataframe.
+    """
+    head = stream.peek(4)[:4]
+    if head[:4] == _ZSTD_MAGIC:
+        return pickle.load(io.BufferedReader(_ZSTD_D.stream_reader(stream)))
+    if head[:2] == _GZIP_MAGIC:
+        return pickle.load(gzip.GzipFile(fileobj=stream))
+    raise ValueError('Unrecognized compression format.')
+
+
+def _dumps_arrow(dataframe: pd.DataFrame | pd.Series) -> bytes:
+    """
+    Serialize a dataframe as an Arrow IPC stream with zstd-compressed
+    buffers. A series is stored as a single-column table.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame or pandas.Series
+        The dataframe to be serialized.
+
+    Returns
+    -------
+    bytes
+        The serialized dataframe.
+    """
+    if isinstance(dataframe, pd.Series):
+        table = pa.Table.from_pandas(
+            dataframe.to_frame(name='values'), preserve_index=True
+        )
+        table = table.replace_schema_metadata(
+            {**table.schema.metadata, _SERIES_KEY: _dumps_json(dataframe.name)}
+        )
+    else:
+        table = pa.Table.from_pandas(dataframe, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression='zstd')
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        for batch in table.to_batches():
+            writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _loads_arrow(stream: io.BufferedReader) -> pd.DataFrame | pd.Series:
+    """
+    Deserialize a dataframe stored with `_dumps_arrow`.
+
+    Parameters
+    ----------
+    stream : io.BufferedReader
+        Stream over the serialized dataframe.
+
+    Returns
+    -------
+    pandas.DataFrame or pandas.Series
+        The deserialized dataframe.
+    """
+    table = pa.ipc.open_stream(stream).read_all()
+    dataframe = table.to_pandas()
+    series_name = (table.schema.metadata or {}).get(_SERIES_KEY)
+    if series_name is not None:
+        series = dataframe.iloc[:, 0]
+        series.name = _loads_json(series_name)
+        return series
+    return dataframe
 
 
 class DB_Handler:
     """
     Database interactions for result storage/retrieval.
 
+    Handlers are not thread-safe. Connections are pooled per database
+    and process, so all handlers of a database must be used from the
+    same thread.
+
     Attributes
     ----------
     db_path : str
         Path to the SQLite database file.
     """
 
+    # Journal mode already set on each database path. `journal_mode`
+    # is persistent, so it only needs to be set once per database.
+    _journal_modes: dict[str, str] = {}
+
     def __init__(
-        self, db_path: str = 'results.db', temp_dir: str | None = None
+        self,
+        db_path: str = 'results.db',
+        temp_dir: str | None = None,
+        wal: bool = False,
     ) -> None:
         """
         Constructor for DB_Handler.
@@ -36,9 +312,16 @@ class DB_Handler:
         temp_dir : str, optional
             Path to the directory for temporary SQLite files, defaults
             to None.
+        wal : bool, optional
+            Use WAL journaling, which lets readers proceed while a
+            record is written. Only for databases accessed from a
+            single host: WAL relies on shared memory and can corrupt
+            a database shared over a network file system by processes
+            on different nodes. Defaults to False (rollback journal).
         """
         self.db_path = db_path
         self.temp_dir = temp_dir
+        self.wal = wal
         self._initialize_db()
 
     def store_data(
@@ -63,38 +346,90 @@ class DB_Handler:
             Simulation log file content.
         """
         identifier = self._generate_new_identifier(identifier)
+        rows = self._record_rows(identifier, dataframe, metadata, log_content)
 
-        df_bytes = pickle.dumps(dataframe)
-        compressed_df_bytes = gzip.compress(df_bytes)
-        metadata_bytes = pickle.dumps(metadata)
-        compressed_metadata_bytes = gzip.compress(metadata_bytes)
-        log_bytes = log_content.encode('utf-8')
-        compressed_log_bytes = gzip.compress(log_bytes)
+        with self._get_connection() as conn:
+            c = conn.cursor()
+            c.execute('BEGIN IMMEDIATE')
+            c.executemany(_INSERT_RECORD, rows)
+            conn.commit()
+
+    def store_data_bulk(
+        self, records: list[tuple[str, pd.DataFrame, str, str]]
+    ) -> None:
+        """
+        Store multiple records in the database in a single
+        transaction.
 
-        chunk_size = 0.5 * 1024 * 1024 * 1024  # 0.5 GB in bytes
-        chunks = [
-            compressed_df_bytes[i : i + int(chunk_size)]
-            for i in range(0, len(compressed_df_bytes), int(chunk_size))
-        ]
+        Parameters
+        ----------
+        records : list of tuple
+            Tuples of `(identifier, dataframe, metadata, log_content)`,
+            as would be passed to `store_data`.
+        """
+        if not records:
+            return
 
         with self._get_connection() as conn:
             c = conn.cursor()
-            for i, chunk in enumerate(chunks):
-                c.execute(
-                    '''
-                    INSERT INTO results_table
-                    (id, chunk_id, data, metadata, log) VALUES (?, ?, ?, ?, ?)
-                    ''',
-                    (
-                        identifier,
-                        i,
-                        chunk,
-                        compressed_metadata_bytes if i == 0 else None,
-                        compressed_log_bytes if i == 0 else None,
-                    ),
+            c.execute('BEGIN IMMEDIATE')
+            for identifier, dataframe, metadata, log_content in records:
+                # (the uncommitted records of this transaction are
+                # taken into account)
+                identifier = self._next_identifier(c, identifier)
+                c.executemany(
+                    _INSERT_RECORD,
+                    self._record_rows(identifier, dataframe, metadata, log_content),
                 )
             conn.commit()
 
+    def _record_rows(
+        self,
+        identifier: str,
+        dataframe: pd.DataFrame,
+        metadata: str,
+        log_content: str,
+    ) -> Iterator[tuple]:
+        """
+        Serialize a record into the rows of `results_table`.
+
+        Parameters
+        ----------
+        identifier : str
+            The (unique) identifier of the record.
+        dataframe : pandas.DataFrame
+            The dataframe to be stored in the database.
+        metadata : dict
+            A dictionary of metadata associated with the simulation.
+        log_content : str
+            Simulation log file content.
+
+        Returns
+        -------
+        Iterator of tuple
+            One row per chunk of the serialized dataframe.
+        """
+        compressed_df_bytes = _dumps_arrow(dataframe)
+        metadata_json, metadata_bytes = self._encode_metadata(metadata)
+        log_bytes = log_content.encode('utf-8')
+        compressed_log_bytes = _compress(log_bytes)
+
+        chunk_size = int(0.5 * 1024 * 1024 * 1024)  # 0.5 GB in bytes
+        df_view = memoryview(compressed_df_bytes)
+        rows = (
+            (
+                identifier,
+                i,
+                df_view[start : start + chunk_size],
+                metadata_bytes if i == 0 else None,
+                metadata_json if i == 0 else None,
+                compressed_log_bytes if i == 0 else None,
+                _FORMAT_ARROW,
+            )
+            for i, start in enumerate(range(0, len(df_view), chunk_size))
+        )
+        return rows
+
     def list_identifiers(self) -> list[str]:
         """
         List all unique identifiers in the database.
@@ -106,11 +441,51 @@ class DB_Handler:
         """
         with self._get_connection() as conn:
             c = conn.cursor()
-            c.execute('SELECT id FROM results_table')
+            # one row per record: later chunks repeat the identifier
+            c.execute('SELECT id FROM results_table WHERE chunk_id = 0')
             identifiers = c.fetchall()
 
         return [item[0] for item in identifiers]
 
+    def list_identifiers_not_in(self, other_db_path: str) -> list[str]:
+        """
+        List the identifiers in the database that are missing from
+        another database.
+
+        The other database is attached to the connection, so the
+        comparison runs in SQLite without listing its identifiers.
+
+        Parameters
+        ----------
+        other_db_path : str
+            Path to the other database, which is expected to have the
+            same schema.
+
+        Returns
+        -------
+        list of str
+            Identifiers that are not present in the other database.
+        """
+        if not os.path.isfile(other_db_path):
+            return self.list_identifiers()
+        with self._get_connection() as conn:
+            c = conn.cursor()
+            c.execute('ATTACH DATABASE ? AS other', (other_db_path,))
+            try:
+                c.execute(
+                    '''
+                    SELECT id FROM results_table
+                    WHERE chunk_id = 0 AND id NOT IN (
+                        SELECT id FROM other.results_table WHERE chunk_id = 0
+                    )
+                    '''
+                )
+                identifiers = c.fetchall()
+            finally:
+                c.execute('DETACH DATABASE other')
+
+        return [item[0] for item in identifiers]
+
     def dataframe_identifiers(
         self, column_names: list[str] | None = None, delimiter: str = '::'
     ) -> pd.DataFrame:
@@ -144,8 +519,8 @@ class DB_Handler:
         return df
 
     def retrieve_data(
-        self, identifier: str
-    ) -> tuple[pd.DataFrame | None, str | None, str | None]:
+        self, identifier: str, as_arrow: bool = False
+    ) -> tuple[pd.DataFrame | pa.Table | None, str | None, str | None]:
         """
         Retrieve data, metadata, and log content for a given
         identifier.
@@ -154,34 +529,105 @@ class DB_Handler:
         ----------
         identifier : str
             The identifier for the data to be retrieved.
+        as_arrow : bool, optional
+            If True, dataframes stored in the Arrow format are
+            returned as a pyarrow.Table, without converting them to
+            pandas. Dataframes stored in other formats are still
+            returned as pandas objects. Defaults to False.
 
         Returns
         -------
         tuple
             A tuple containing a pandas.DataFrame, metadata
             dictionary, and log content string.
+            Metadata is returned as given to `store_data`, except
+            that numpy scalars may come back as Python numbers.
         """
         with self._get_connection() as conn:
             c = conn.cursor()
             c.execute(
-                'SELECT data, metadata, log FROM results_table '
+                'SELECT data, metadata_json, metadata, log, format '
+                'FROM results_table '
                 'WHERE id = ? ORDER BY chunk_id',
                 (identifier,),
             )
-            rows = c.fetchall()
-
-        if rows:
-            compressed_df_bytes = b''.join(row[0] for row in rows)
-            dataframe = pickle.loads(gzip.decompress(compressed_df_bytes))
+            row = c.fetchone()
+            if not row:
+                return None, None, None
 
             # Assume metadata and log are stored only in the first chunk
-            metadata = pickle.loads(gzip.decompress(rows[0][1])) if rows[0][1] else None
-            log_content = (
-                gzip.decompress(rows[0][2]).decode('utf-8') if rows[0][2] else None
+            first_chunk, metadata_json, metadata, log, data_format = row
+            del row
+            # Decode while the remaining chunks are fetched one at a time
+            stream = io.BufferedReader(
+                _ChunkReader(itertools.chain((first_chunk,), (r[0] for r in c)))
             )
+            del first_chunk
+            if data_format == _FORMAT_ARROW and as_arrow:
+                dataframe = pa.ipc.open_stream(stream).read_all()
+            elif data_format == _FORMAT_ARROW:
+                dataframe = _loads_arrow(stream)
+            else:
+                dataframe = _loads_dataframe(stream)
+            del stream
+
+        metadata = self._decode_metadata(metadata_json, metadata)
+        log_content = _decompress(log).decode('utf-8') if log else None
+
+        return dataframe, metadata, log_content
+
+    def retrieve_data_bulk(self, identifiers: list[str]) -> dict:
+        """
+        Retrieve the dataframes of a given list of identifiers. The
+        identifiers are queried in batches that stay below SQLite's
+        limit on the number of bound parameters. Metadata and log
+        content are not retrieved.
+
+        Parameters
+        ----------
+        identifiers : list of str
+            A list of identifiers for the data to be retrieved.
+
+        Returns
+        -------
+        dict
+            A dictionary with identifiers as keys and
+            pandas.DataFrame objects as values. Identifiers that are
+            not in the database are omitted.
+        """
+        results: dict[str, pd.DataFrame] = {}
+        if not identifiers:
+            return results
+
+        identifiers_tuple = tuple(identifiers)
+
+        with self._get_connection() as conn:
+            c = conn.cursor()
+            for start in range(0, len(identifiers_tuple), _MAX_SQL_PARAMS):
+                batch = identifiers_tuple[start : start + _MAX_SQL_PARAMS]
+                query = (
+                    f"SELECT id, data, format FROM results_table "
+                    f"WHERE id IN ({','.join('?' * len(batch))}) "
+                    f"ORDER BY id, chunk_id"
+                )
+                c.execute(query, batch)
+                # consecutive rows of the same id are the chunks of
+                # one record
+                for identifier, rows in itertools.groupby(c, key=lambda r: r[0]):
+                    _, first_chunk, data_format = next(rows)
+                    stream = io.BufferedReader(
+                        _ChunkReader(
+                            itertools.chain((first_chunk,), (r[1] for r in rows))
+                        )
+                    )
+                    del first_chunk
+                    if data_format == _FORMAT_ARROW:
+                        results[identifier] = _loads_arrow(stream)
+                    else:
+                        results[identifier] = _loads_dataframe(stream)
+                    del stream
 
-            return dataframe, metadata, log_content
-        return None, None, None
+        return results
 
     def retrieve_metadata_only(self, identifier: str) -> tuple[str | None, str | None]:
         """
@@ -197,67 +643,98 @@ class DB_Handler:
         tuple
             A tuple containing a metadata dictionary and log content
             string.
+            Metadata is returned as given to `store_data`, except
+            that numpy scalars may come back as Python numbers.
         """
         with self._get_connection() as conn:
             c = conn.cursor()
             # Fetch only the first chunk for the given identifier
             c.execute(
-                'SELECT metadata, log FROM results_table '
+                'SELECT metadata_json, metadata, log FROM results_table '
                 'WHERE id = ? AND chunk_id = 0',
                 (identifier,),
             )
             row = c.fetchone()
 
         if row:
-            metadata, log = row
-            metadata = pickle.loads(gzip.decompress(metadata)) if metadata else None
-            log_content = gzip.decompress(log).decode('utf-8') if log else None
+            metadata_json, metadata, log = row
+            metadata = self._decode_metadata(metadata_json, metadata)
+            log_content = _decompress(log).decode('utf-8') if log else None
 
             return metadata, log_content
 
         return None, None
 
+    def retrieve_log(self, identifier: str) -> str | None:
+        """
+        Retrieve only the log content for a given identifier, without
+        reading its data.
+
+        Parameters
+        ----------
+        identifier : str
+            The identifier for the log to be retrieved.
+
+        Returns
+        -------
+        str or None
+            The log content string.
+        """
+        with self._get_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                'SELECT log FROM results_table WHERE id = ? AND chunk_id = 0',
+                (identifier,),
+            )
+            row = c.fetchone()
+
+        if row and row[0]:
+            return _decompress(row[0]).decode('utf-8')
+        return None
+
     def retrieve_metadata_only_bulk(self, identifiers: list[str]) -> dict:
         """
         Retrieve only metadata and log content for a given list of
-        identifiers using a single database query.
+        identifiers. The identifiers are queried in batches that stay
+        below SQLite's limit on the number of bound parameters.
 
         Parameters
         ----------
         identifiers : list of str
             A list of identifiers for the metadata and logs to be
-            retrieved. The length of the list should be less than
-            1000.
+            retrieved.
 
         Returns
         -------
         dict
             A dictionary with identifiers as keys and tuples of
             metadata and log content as values.
+            Metadata is returned as given to `store_data`, except
+            that numpy scalars may come back as Python numbers.
         """
         results: dict[str, tuple[Any, str | None]] = {}
         if not identifiers:
             return results
 
-        # Use a tuple of identifiers to use the IN clause in SQL query
         identifiers_tuple = tuple(identifiers)
 
         with self._get_connection() as conn:
             c = conn.cursor()
-            # The SQL query uses the IN clause to fetch all relevant entries at once
-            query = (
-                f"SELECT id, metadata, log FROM results_table "
-                f"WHERE id IN ({','.join('?' * len(identifiers))}) "
-                f"AND chunk_id = 0"
-            )
-            c.execute(query, identifiers_tuple)
-            rows = c.fetchall()
-
-            for row in rows:
-                identifier, metadata, log = row
-                metadata = pickle.loads(gzip.decompress(metadata)) if metadata else None
-                log_content = gzip.decompress(log).decode('utf-8') if log else None
-                results[identifier] = (metadata, log_content)
+            for start in range(0, len(identifiers_tuple), _MAX_SQL_PARAMS):
+                batch = identifiers_tuple[start : start + _MAX_SQL_PARAMS]
+                # The IN clause fetches all entries of the batch at once
+                query = (
+                    f"SELECT id, metadata_json, metadata, log FROM results_table "
+                    f"WHERE id IN ({','.join('?' * len(batch))}) "
+                    f"AND chunk_id = 0"
+                )
+                c.execute(query, batch)
+                for identifier, metadata_json, metadata, log in c:
+                    metadata = self._decode_metadata(metadata_json, metadata)
+                    log_content = (
+                        _decompress(log).decode('utf-8') if log else None
+                    )
+                    results[identifier] = (metadata, log_content)
 
         return results
 
@@ -275,10 +752,84 @@ class DB_Handler:
             c.execute('DELETE FROM results_table WHERE id = ?', (identifier,))
             conn.commit()
 
-    def _get_connection(self) -> sqlite3.Connection:
+    def delete_records(self, identifiers: list[str]) -> None:
+        """
+        Delete multiple records from the database in a single
+        transaction.
+
+        Parameters
+        ----------
+        identifiers : list of str
+            The identifiers of the records to be deleted.
+        """
+        if not identifiers:
+            return
+
+        identifiers_tuple = tuple(identifiers)
+
+        with self._get_connection() as conn:
+            c = conn.cursor()
+            for start in range(0, len(identifiers_tuple), _MAX_SQL_PARAMS):
+                batch = identifiers_tuple[start : start + _MAX_SQL_PARAMS]
+                c.execute(
+                    f"DELETE FROM results_table "
+                    f"WHERE id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+            conn.commit()
+
+    def close(self) -> None:
+        """
+        Close all pooled connections to the database.
+
+        """
+        pid = os.getpid()
+        keys = [key for key in _POOL if key[:2] == (self.db_path, pid)]
+        for key in keys:
+            pool = _POOL.pop(key)
+            while not pool.empty():
+                pool.get_nowait().close()
+
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Check out a connection from the pool, opening one if none is
+        available. On exit the transaction is committed (or rolled
+        back if an exception was raised) and the connection is
+        returned to the pool instead of being closed.
+
+        Yields
+        ------
+        sqlite3.Connection
+            A connection object to the SQLite database.
+        """
+        key = (self.db_path, os.getpid(), self.wal, self.temp_dir)
+        pool = _POOL.setdefault(key, queue.LifoQueue())
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            pool.put(conn)
+
+    def _connect(self) -> sqlite3.Connection:
         """
         Establish and return a new database connection.
 
+        With `wal`, the database uses WAL journaling with
+        `synchronous=NORMAL`. Commits then no longer wait for an
+        fsync, so the most recent transactions may be lost on power
+        failure or an OS crash (the database itself stays consistent,
+        and application crashes lose nothing). Otherwise the default
+        rollback journal is used.
+
         Returns
         -------
         sqlite3.Connection
@@ -292,8 +843,73 @@ class DB_Handler:
 
         conn = sqlite3.connect(self.db_path)
         conn.execute('PRAGMA busy_timeout = 600000')  # Set timeout to 10 minutes
+        # (a database left in WAL mode is switched back if `wal` is
+        # not set)
+        journal_mode = 'WAL' if self.wal else 'DELETE'
+        if DB_Handler._journal_modes.get(self.db_path) != journal_mode:
+            conn.execute(f'PRAGMA journal_mode = {journal_mode}')
+            DB_Handler._journal_modes[self.db_path] = journal_mode
+        if self.wal:
+            conn.execute('PRAGMA synchronous = NORMAL')
+            conn.execute('PRAGMA wal_autocheckpoint = 1000')
+        if not self.temp_dir:
+            conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA mmap_size = 10737418240')  # 10 GB
+        conn.execute('PRAGMA cache_size = -65536')  # 64 MB
         return conn
 
+    def _encode_metadata(self, metadata: Any) -> tuple[str | None, bytes | None]:
+        """
+        Encode the metadata of a record as JSON if it is restored
+        unchanged from it, and as a pickled BLOB otherwise (e.g. for
+        tuples, non-string keys or objects JSON cannot represent).
+
+        Parameters
+        ----------
+        metadata : Any
+            The metadata to be encoded.
+
+        Returns
+        -------
+        tuple
+            Contents of the `metadata_json` and `metadata` columns,
+            one of which is None.
+        """
+        try:
+            metadata_json = _dumps_json(metadata)
+        except TypeError:
+            pass
+        else:
+            loaded = _loads_json(metadata_json)
+            if type(loaded) is type(metadata) and loaded == metadata:
+                return metadata_json, None
+        return None, _compress(pickle.dumps(metadata))
+
+    def _decode_metadata(
+        self, metadata_json: str | None, metadata: bytes | None
+    ) -> Any:
+        """
+        Decode the metadata of a record, preferring the JSON column
+        and falling back to the pickled BLOB of older records.
+
+        Parameters
+        ----------
+        metadata_json : str or None
+            Content of the `metadata_json` column.
+        metadata : bytes or None
+            Content of the `metadata` column.
+
+        Returns
+        -------
+        Any
+            The metadata, or None if the record has none.
+        """
+        if metadata_json is not None:
+            return _loads_json(metadata_json)
+        if metadata:
+            return pickle.loads(_decompress(metadata))
+        return None
+
     def _initialize_db(self) -> None:
         """
         Initialize the database by creating necessary tables.
@@ -309,10 +925,19 @@ class DB_Handler:
                     data BLOB,
                     metadata BLOB,
                     log BLOB,
+                    format TEXT,
+                    metadata_json TEXT,
                     PRIMARY KEY (id, chunk_id)
                 )
                '''
             )
+            # add columns to databases created before they existed,
+            # in the order of the table definition above
+            c.execute('PRAGMA table_info(results_table)')
+            columns = [row[1] for row in c.fetchall()]
+            for column in ('format', 'metadata_json'):
+                if column not in columns:
+                    c.execute(f'ALTER TABLE results_table ADD COLUMN {column} TEXT')
             conn.commit()
 
     def _generate_new_identifier(self, identifier: str) -> str:
@@ -332,23 +957,48 @@ class DB_Handler:
             A new unique identifier derived from the base identifier.
         """
         with self._get_connection() as conn:
-            c = conn.cursor()
-            # Fetch all identifiers starting with the base identifier
-            pattern = f'{identifier}%'
+            return self._next_identifier(conn.cursor(), identifier)
+
+    @staticmethod
+    def _next_identifier(c: sqlite3.Cursor, identifier: str) -> str:
+        """
+        Generate a new unique identifier using an existing cursor.
+
+        Parameters
+        ----------
+        c : sqlite3.Cursor
+            Cursor of the connection to query.
+        identifier : str
+            The base identifier to be used for generating a new unique
+            identifier.
+
+        Returns
+        -------
+        str
+            A new unique identifier derived from the base identifier.
+        """
+        # Escape GLOB metacharacters in the base identifier
+        glob_base = re.sub(r'([*?\[])', r'[\1]', identifier)
+        suffix_start = len(identifier) + 2
+        c.execute(
+            'SELECT EXISTS(SELECT 1 FROM results_table WHERE id = ?)',
+            (identifier,),
+        )
+        exists = c.fetchone()[0]
+        if exists:
+            # Largest numeric suffix among `{identifier}_<digits>`.
+            # The GLOB prefix match uses the primary key index.
             c.execute(
-                'SELECT id FROM results_table WHERE id LIKE ? ORDER BY id',
-                (pattern,),
+                'SELECT MAX(CAST(substr(id, ?) AS INTEGER)) '
+                'FROM results_table '
+                'WHERE id GLOB ? AND substr(id, ?) NOT GLOB \'*[^0-9]*\'',
+                (suffix_start, f'{glob_base}_[0-9]*', suffix_start),
             )
-            existing_ids = [row[0] for row in c.fetchall()]
+            max_number = c.fetchone()[0]
 
         # Determine the next unique identifier
-        if identifier in existing_ids:
-            numbers = [
-                int(id_.split('_')[-1])
-                for id_ in existing_ids
-                if id_.startswith(f'{identifier}_') and id_.split('_')[-1].isdigit()
-            ]
-            next_number = max(numbers) + 1 if numbers else 1
+        if exists:
+            next_number = max_number + 1 if max_number is not None else 1
             new_identifier = f'{identifier}_{next_number}'
         else:
             new_identifier = identifier
@@ -4,6 +4,7 @@ ground motions for each archetype and hazard level.
 
 """
 
+from io import StringIO
 import numpy as np
 import pandas as pd
 from src.util import store_info
@@ -37,13 +38,16 @@ def main() -> None:
                 f"extra/structural_analysis/results/"
                 f"site_hazard/{arch}/deaggregation_{hz + 1}.txt"
             )
+            # Drop the two header and four footer lines and use a
+            # single-character delimiter, so that the C parser can be
+            # used instead of the python one.
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()[2:-4]
             df = pd.read_csv(
-                path,
-                skiprows=2,
-                skipfooter=4,
-                sep=" = ",
+                StringIO("\n".join(lines).replace(" = ", "\t")),
+                sep="\t",
                 index_col=0,
-                engine="python",
+                engine="c",
                 header=None,
             )
             df.index.name = "parameter"
@@ -63,35 +67,29 @@ def main() -> None:
     )
 
     # generate input file for CS_Selection
-    rows = []
-    for arch in cases:
-        for hz in range(num_hz_adjusted):
-            rows.append(
-                [
-                    conditioning_periods[arch],
-                    df.at[(arch, f"hz_{hz + 1}"), "Mbar"],
-                    df.at[(arch, f"hz_{hz + 1}"), "Dbar"],
-                    df.at[(arch, f"hz_{hz + 1}"), "Ebar"],
-                    vs30,
-                    f"extra/structural_analysis/results/site_hazard/{arch}/",
-                    f"required_records_hz_{hz + 1}.txt",
-                    arch,
-                    hz + 1,
-                ]
-            )
+    hz_levels = np.arange(1, num_hz_adjusted + 1)
+    row_index = pd.MultiIndex.from_product([cases, [f"hz_{hz}" for hz in hz_levels]])
+    values = df.loc[row_index, ["Mbar", "Dbar", "Ebar"]].to_numpy(dtype=float)
+    archs = np.repeat(np.array(cases, dtype=object), num_hz_adjusted)
     df_css = pd.DataFrame(
-        rows,
-        columns=[
-            "Tcond",
-            "M_bar",
-            "Rjb",
-            "eps_bar",
-            "Vs30",
-            "outputDir",
-            "outputFile",
-            "code",
-            "hazard_level",
-        ],
+        {
+            "Tcond": np.repeat(
+                conditioning_periods.loc[cases].to_numpy(), num_hz_adjusted
+            ),
+            "M_bar": values[:, 0],
+            "Rjb": values[:, 1],
+            "eps_bar": values[:, 2],
+            "Vs30": np.full(len(archs), vs30),
+            "outputDir": [
+                f"extra/structural_analysis/results/site_hazard/{arch}/"
+                for arch in archs
+            ],
+            "outputFile": [
+                f"required_records_hz_{hz}.txt" for hz in np.tile(hz_levels, len(cases))
+            ],
+            "code": archs,
+            "hazard_level": np.tile(hz_levels, len(cases)),
+        }
     )
     df_css.to_csv(
         store_info(
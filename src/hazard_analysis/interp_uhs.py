@@ -4,11 +4,45 @@ curve and obtain the Sa value at a given MAPE
 """
 
 import argparse
+from functools import lru_cache
 import pandas as pd
+from extra.structural_analysis.src.util import binary_copy_is_current
 from extra.structural_analysis.src.util import interpolate_pd_series
 
 # use: python -m src.hazard_analysis.interp_uhs --period 0.75 --mape 1e-1
 
+HAZARD_CURVES_PATH = "extra/structural_analysis/results/site_hazard/hazard_curves"
+
+
+@lru_cache(maxsize=None)
+def load_hazard_curves():
+    """
+    Load the hazard curves, preferring the parquet copy written by
+    `site_hazard` over the CSV file if it is up to date.
+    """
+    csv_path = f"{HAZARD_CURVES_PATH}.csv"
+    parquet_path = f"{HAZARD_CURVES_PATH}.parquet"
+    if binary_copy_is_current(parquet_path, csv_path):
+        return pd.read_parquet(parquet_path)
+    df = pd.read_csv(csv_path, index_col=0, header=[0, 1])
+    df.columns = pd.MultiIndex.from_tuples(
+        [(float(period_str), kind) for period_str, kind in df.columns]
+    )
+    return df
+
+
+@lru_cache(maxsize=None)
+def get_inv_curve(period):
+    """
+    Get the inverse hazard curve (Sa as a function of MAPE) for a
+    given period.
+    """
+    hz_curv = load_hazard_curves()[(period, "MAPE")]
+    hz_curv_inv = pd.Series(hz_curv.index.to_numpy(), index=hz_curv.to_numpy())
+    hz_curv_inv.index.name = "MAPE"
+    hz_curv_inv.name = period
+    return hz_curv_inv
+
 
 def main():
     parser = argparse.ArgumentParser()
@@ -19,22 +53,7 @@ def main():
     period = float(args.period)
     mape = float(args.mape)
 
-    # load hazard curve
-    df = pd.read_csv(
-        "extra/structural_analysis/results/site_hazard/hazard_curves.csv",
-        index_col=0,
-        header=[0, 1],
-    )
-    new_cols = []
-    for col in df.columns:
-        new_cols.append((float(col[0]), col[1]))
-    df.columns = pd.MultiIndex.from_tuples(new_cols)
-    hz_curv = df[(period, "MAPE")]
-    hz_curv_inv = pd.Series(hz_curv.index.to_numpy(), index=hz_curv.to_numpy())
-    hz_curv_inv.index.name = "MAPE"
-    hz_curv_inv.name = period
-
-    sa_val = interpolate_pd_series(hz_curv_inv, mape)
+    sa_val = interpolate_pd_series(get_inv_curve(period), mape)
     print(sa_val)
 
 
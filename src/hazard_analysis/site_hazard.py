@@ -17,7 +17,9 @@ Note
 
 """
 
+import warnings
 from scipy.interpolate import interp1d
+from scipy.interpolate import CubicSpline
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -29,6 +31,28 @@ from extra.structural_analysis.src.util import read_study_param
 np.seterr(divide="ignore")
 
 
+def cubic_spline(x, y, extrapolate=True):
+    """
+    Fit a not-a-knot cubic spline through the finite (x, y) points,
+    sorted by x. Points that are not finite (e.g. the logarithm of a
+    zero exceedance rate) cannot be fitted and are dropped with a
+    warning.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not np.all(finite):
+        warnings.warn(
+            f"Dropping {np.count_nonzero(~finite)} non-finite "
+            f"hazard curve points out of {len(finite)} before fitting.",
+            stacklevel=2,
+        )
+        x = x[finite]
+        y = y[finite]
+    order = np.argsort(x)
+    return CubicSpline(x[order], y[order], extrapolate=extrapolate)
+
+
 def main() -> None:
     out_path = "extra/structural_analysis/results/site_hazard"
 
@@ -46,34 +70,46 @@ def main() -> None:
     # fmt: on
     hzrd_crv_files = [f"{out_path}/{name}.txt" for name in names]
 
-    dfs_sub = []
+    # MAPE and MAFE values, indexed by (Sa, period, type)
+    curves = None
+    sa_values = None
 
-    for filepath in hzrd_crv_files:
+    for i, filepath in enumerate(hzrd_crv_files):
+        # scan the header up to the data block, then read the data
+        # rows directly from the file
         with open(filepath, "r", encoding="utf-8") as f:
-            line = f.read()
-        contents = line.split("\n")
-        i_begin = -1
-        num_points = -1
-        for i, c in enumerate(contents):
-            words = c.split(" ")
-            if words[0] == "X," and words[1] == "Y" and words[2] == "Data:":
-                i_begin = i + 1
-            if words[0] == "Num":
-                num_points = int(words[2])
-        i_end = i_begin + num_points
-        data = np.genfromtxt(contents[i_begin:i_end])
-        df = pd.DataFrame(data[:, 1], index=data[:, 0], columns=["MAPE"])
-        df.index.name = "Sa"
-        df["MAFE"] = -np.log(1.00 - df["MAPE"])
-        dfs_sub.append(df)
-
-    df = pd.concat(dfs_sub, axis=1, keys=periods)
-    df.columns.names = ["T", "Type"]
+            num_points = None
+            for line in f:
+                words = line.split()
+                if words[:1] == ["Num"]:
+                    num_points = int(words[2])
+                if words[:3] == ["X,", "Y", "Data:"]:
+                    break
+            data = np.loadtxt(f, max_rows=num_points, ndmin=2)
+        if curves is None:
+            sa_values = data[:, 0]
+            curves = np.empty((len(sa_values), len(periods), 2))
+        elif not np.array_equal(data[:, 0], sa_values):
+            raise ValueError(f"Inconsistent Sa values in {filepath}")
+        curves[:, i, 0] = data[:, 1]
+        curves[:, i, 1] = -np.log1p(-data[:, 1])
+
+    if curves is None or sa_values is None:
+        raise ValueError("No hazard curve files were read.")
+    df = pd.DataFrame(
+        curves.reshape(len(sa_values), -1),
+        index=pd.Index(sa_values, name="Sa"),
+        columns=pd.MultiIndex.from_product(
+            [periods, ["MAPE", "MAFE"]], names=["T", "Type"]
+        ),
+    )
 
     df_mafe = df.xs("MAFE", axis=1, level=1)  # type: ignore
 
     # save the hazard curves
     df.to_csv(store_info(f"{out_path}/hazard_curves.csv"))
+    # binary copy with a float period level, read by `interp_uhs`
+    df.to_parquet(store_info(f"{out_path}/hazard_curves.parquet"))
 
     # Obtain period-specific hazard curve
     # Interpolate available hazard curves
@@ -88,30 +124,30 @@ def main() -> None:
     df[("target", "MAFE")] = target_mafes
 
     # Define interpolation functions for the period-specific hazard curve
+    # The splines are fitted once and reused for every evaluation.
+    log_target_mafe_curve = np.log(df[("target", "MAFE")]).to_numpy()
+    log_sa_curve = np.log(df.index.to_numpy())
+    interp_mafe_to_sa = cubic_spline(
+        log_target_mafe_curve, log_sa_curve, extrapolate=False
+    )
+    interp_sa_to_mafe = cubic_spline(log_sa_curve, log_target_mafe_curve)
+
     # Interpolate: From MAFE λ to intensity e [g]
     def fHazMAFEtoSa(mafe):
         """
         Interpolate Sa for a given MAFE
         """
-        temp1 = interp1d(
-            np.log(df[("target", "MAFE")]).to_numpy(),
-            np.log(df.index.to_numpy()),
-            kind="cubic",
-        )
-        return np.exp(temp1(np.log(mafe)))
+        log_sa = interp_mafe_to_sa(np.log(mafe))
+        if np.any(np.isnan(log_sa)):
+            raise ValueError("MAFE outside the range of the hazard curve.")
+        return np.exp(log_sa)
 
     # Interpolate: Inverse (From intensity e [g] to MAFE λ)
     def fHazSatoMAFE(sa):
         """
         Interpolate MAFE for a given Sa
         """
-        temp2 = interp1d(
-            np.log(df.index).to_numpy(),
-            np.log(df[("target", "MAFE")]).to_numpy(),
-            kind="cubic",
-            fill_value='extrapolate',
-        )
-        return np.exp(temp2(np.log(sa)))
+        return np.exp(interp_sa_to_mafe(np.log(sa)))
 
     # Specify Intensity range
     if t_bar <= 1.00:
@@ -139,30 +175,35 @@ def main() -> None:
     #   will fall exactly on the design and MCE level
     #   scenarios.
 
+    def snap_to_level(e_vec, e_target, lower_idx=None):
+        """
+        Shift the intensities so that the midpoint closest to
+        `e_target` falls exactly on it. The shift tapers linearly to
+        zero towards the end of the range and towards the start of
+        the range, or towards `lower_idx` if provided, which is left
+        unchanged.
+        """
+        dif = e_target - e_vec
+        idx = 2 * int(np.abs(dif[1::2]).argmin()) + 1
+        corr = np.full(len(e_vec), 0.00)
+        if lower_idx is None:
+            corr[0 : idx + 1] = np.linspace(0, dif[idx], idx + 1)
+        else:
+            corr[lower_idx + 1 : idx] = np.linspace(
+                0, dif[idx], idx - (lower_idx + 1)
+            )
+        corr[idx::] = np.linspace(dif[idx], 0, len(e_vec) - idx)
+        e_vec = e_vec + corr
+        return e_vec, fHazSatoMAFE(e_vec), idx
+
     k = -1
     if mafe_vec[-1] < mafe_des < mafe_vec[0]:
         # identify index closest to design lvl
-        dif = np.full(m * 2 + 1, 0.00)
-        for i, e in enumerate(e_vec):
-            dif[i] = e_des - e
-        k = 2 * int(np.argmin(dif[1::2] ** 2)) + 1
-        corr = np.full(len(e_vec), 0.00)
-        corr[0 : k + 1] = np.linspace(0, dif[k], k + 1)
-        corr[k::] = np.linspace(dif[k], 0, m * 2 - k + 1)
-        e_vec = e_vec + corr
-        mafe_vec = fHazSatoMAFE(e_vec)
+        e_vec, mafe_vec, k = snap_to_level(e_vec, e_des)
 
     if mafe_vec[-1] < mafe_mce < mafe_vec[0]:
         # identify index closest to MCE lvl
-        dif = np.full(m * 2 + 1, 0.00)
-        for i, e in enumerate(e_vec):
-            dif[i] = e_mce - e
-        k2 = 2 * np.argmin(dif[1::2] ** 2) + 1
-        corr = np.full(len(e_vec), 0.00)
-        corr[k + 1 : k2] = np.linspace(0, dif[k2], k2 - (k + 1))
-        corr[k2::] = np.linspace(dif[k2], 0, m * 2 - k2 + 1)
-        e_vec = e_vec + corr
-        mafe_vec = fHazSatoMAFE(e_vec)
+        e_vec, mafe_vec, _ = snap_to_level(e_vec, e_mce, lower_idx=k)
 
     e_Endpoints = e_vec[::2]
     MAFE_Endpoints = mafe_vec[::2]
@@ -197,12 +238,8 @@ def main() -> None:
     e_Endpoints = np.concatenate((e_Endpoints, endpoints_beyond))
     MAFE_Endpoints = np.concatenate((MAFE_Endpoints, mafe_endpoints_beyond))
 
-    delta_e = np.array(
-        [e_Endpoints[i + 1] - e_Endpoints[i] for i in range(m_adjusted)]
-    )
-    delta_lamda = np.array(
-        [MAFE_Endpoints[i] - MAFE_Endpoints[i + 1] for i in range(m_adjusted)]
-    )
+    delta_e = np.diff(e_Endpoints)
+    delta_lamda = -np.diff(MAFE_Endpoints)
 
     MAPE_Midpoints = 1 - np.exp(-MAFE_Midpoints)
     return_period_midpoints = 1 / MAFE_Midpoints
@@ -243,45 +280,48 @@ def main() -> None:
 
     # store hazard curve interval data
     interv_df = pd.DataFrame(
-        np.column_stack(
-            (
-                e_Midpoints,
-                delta_e,
-                delta_lamda,
-                MAFE_Midpoints,
-                MAPE_Midpoints,
-                return_period_midpoints,
-            )
-        ),
-        columns=["e", "de", "dl", "freq", "prob", "T"],
-        index=range(1, m_adjusted + 1),
+        {
+            "e": e_Midpoints,
+            "de": delta_e,
+            "dl": delta_lamda,
+            "freq": MAFE_Midpoints,
+            "prob": MAPE_Midpoints,
+            "T": return_period_midpoints,
+        },
+        index=pd.RangeIndex(1, m_adjusted + 1),
     )
     interv_df.to_csv(store_info(f"{out_path}/Hazard_Curve_Interval_Data.csv"))
 
     # Obtain Uniform Hazard Spectra for each midpoint
 
-    uhs_dfs = []
+    # One spline per period, evaluated at all midpoints at once.
+    # rs_matrix has one row per spectrum and one column per period.
+    log_target_mafes = np.log(MAFE_Midpoints)
+    rs_matrix = np.exp(
+        np.column_stack(
+            [
+                cubic_spline(np.log(df[(period, "MAFE")].to_numpy()), log_sa_curve)(
+                    log_target_mafes
+                )
+                for period in periods
+            ]
+        )
+    )
 
-    spectrum_idx = 0
-    for spectrum_idx in range(m_adjusted):
-        rs: list[float] = []
-        target_mafe = MAFE_Midpoints[spectrum_idx]
-        for period in periods:
-            log_mafe = np.log(df[(period, "MAFE")].to_numpy())
-            log_sa = np.log(df.index.to_numpy())
-            log_target_mafe = np.log(target_mafe)
-            f = interp1d(log_mafe, log_sa, kind="cubic", fill_value='extrapolate')
-            log_target_sa = float(f(log_target_mafe))  # type: ignore
-            target_sa = np.exp(log_target_sa)
-            rs.append(target_sa)
-        uhs = np.column_stack((periods, rs))
-        uhs_df = pd.DataFrame(uhs, columns=["T", "Sa"])
-        uhs_df.set_index("T", inplace=True)
+    uhs_dfs = []
+    for rs in rs_matrix:
+        uhs_df = pd.DataFrame({"Sa": rs}, index=pd.Index(periods, name="T"))
         uhs_dfs.append(uhs_df)
 
     # write UHS data to files
     for i, uhs_df in enumerate(uhs_dfs):
         uhs_df.to_csv(store_info(f"{out_path}/UHS_{i + 1}.csv"))
+    # all spectra in a single binary file, one column per hazard level
+    pd.DataFrame(
+        rs_matrix.T,
+        index=pd.Index(periods, name="T"),
+        columns=[f"{i + 1}" for i in range(m_adjusted)],
+    ).to_parquet(store_info(f"{out_path}/UHS.parquet"))
 
     def plot_uhs_spectra():
         uhs_df = pd.concat(uhs_dfs, axis=1)
@@ -2,62 +2,129 @@
 Check analysis status based on the contents of the log files
 """
 
+import mmap
 import re
+from contextlib import contextmanager
 from datetime import datetime
 from itertools import product
 import pandas as pd
 from extra.structural_analysis.src.util import read_study_param
-from extra.structural_analysis.src.util import file_exists
-from extra.structural_analysis.src.util import check_last_line
-from extra.structural_analysis.src.util import check_any_line
 
 
-def status_from_log(logfile):
+# Logs are scanned as bytes, directly on a memory map of the file.
+_SUBDIV_RE = re.compile(rb'\bnum_subdiv: (\d+)\b')
+_DATE_FORMAT = '%m/%d/%Y %I:%M:%S %p'
+
+
+@contextmanager
+def _map_log(logfile):
     """
-    Parse a logfile and determine the analysis status
+    Map a logfile into memory for read-only byte-level scanning
     """
+    with open(logfile, 'rb') as f:
+        # empty files cannot be mapped
+        if f.seek(0, 2) == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
 
-    pypath = logfile.replace('log', 'log_python')
-    ex = file_exists(logfile)
-    if not ex:
-        return 'not found'
-    if file_exists(pypath):
-        if check_any_line(pypath, "Error"):
-            return 'error'
-    if check_any_line(logfile, "Analysis interrupted"):
+
+def _first_line(content):
+    """
+    Get the first line of a log
+    """
+    end = content.find(b'\n')
+    return content[: end if end != -1 else len(content)]
+
+
+def _last_line(content):
+    """
+    Get the last line of a log, ignoring a trailing newline
+    """
+    end = len(content)
+    if content[end - 1 : end] == b'\n':
+        end -= 1
+    return content[content.rfind(b'\n', 0, end) + 1 : end]
+
+
+def _status_from_content(content, pypath):
+    """
+    Determine the analysis status from the contents of a logfile
+    """
+    try:
+        with _map_log(pypath) as py_content:
+            if py_content.find(b"Error") != -1:
+                return 'error'
+    except FileNotFoundError:
+        pass
+    if content.find(b"Analysis interrupted") != -1:
         return 'interrupted'
-    if check_any_line(logfile, "Analysis failed to converge"):
+    if content.find(b"Analysis failed to converge") != -1:
         return "failed to converge"
-    if check_last_line(logfile, "Analysis finished"):
+    if b"Analysis finished" in _last_line(content):
         return 'finished'
     return "running"
 
 
+def _logtime_from_line(line):
+    """
+    Parse the date at the start of a logfile line
+    """
+    return datetime.strptime(line[:22].decode('utf-8'), _DATE_FORMAT)
+
+
+def _max_subdiv_from_content(content):
+    """
+    Get the largest time step subdivision reported in a log
+    """
+    return max(map(int, _SUBDIV_RE.findall(content)), default=None)
+
+
+def analyze_log(logfile):
+    """
+    Parse a logfile once and determine the analysis status, start
+    time, end time, and largest reported time step subdivision
+    """
+    try:
+        with _map_log(logfile) as content:
+            status = _status_from_content(content, logfile.replace('log', 'log_python'))
+            if not content:
+                return status, None, None, None
+            start_time = _logtime_from_line(_first_line(content))
+            end_time = _logtime_from_line(_last_line(content))
+            sub = _max_subdiv_from_content(content)
+    except FileNotFoundError:
+        return 'not found', None, None, None
+    return status, start_time, end_time, sub
+
+
+def status_from_log(logfile):
+    """
+    Parse a logfile and determine the analysis status
+    """
+    try:
+        with _map_log(logfile) as content:
+            return _status_from_content(content, logfile.replace('log', 'log_python'))
+    except FileNotFoundError:
+        return 'not found'
+
+
 def get_logtime(logfile, idx):
     """
     Parse a logfile and determine the time the analysis started.
     """
-    with open(logfile, 'r', encoding='utf-8') as f:
+    with open(logfile, 'rb') as f:
         lines = f.readlines()
-    line = lines[idx]
-    date_string = line[:22]
-    date_format = '%m/%d/%Y %I:%M:%S %p'
-    date_object = datetime.strptime(date_string, date_format)
-    return date_object
+    return _logtime_from_line(lines[idx])
 
 
 def get_max_subdiv_reported(logfile):
     """
     Get the largest reported time step subdivision
     """
-    with open(logfile, 'r', encoding='utf-8') as f:
-        log_content = f.read()
-    pattern = r'\bnum_subdiv: (\d+)\b'
-    matches = re.findall(pattern, log_content)
-    num_subdiv_values = [int(match) for match in matches]
-    if num_subdiv_values:
-        return max(num_subdiv_values)
-    return None
+    with _map_log(logfile) as content:
+        return _max_subdiv_from_content(content)
 
 
 if __name__ == "__main__":
@@ -70,19 +137,23 @@ if __name__ == "__main__":
     hzs = [f"{i + 1}" for i in range(nhz)]
     gms = [f"gm{i + 1}" for i in range(ngm_cs)]
 
-    keys = []
-    vals: dict[str, list] = {'status': [], 'start_time': [], 'end_time': [], 'sub': []}
-    for at, st, rc, hz, gm, dr in product(atypes, stors, rcs, hzs, gms, ('x', 'y')):
-        key = "-".join((at, st, rc, hz, gm, dr))
-        keys.append(key)
+    def analyze_case(case):
+        """
+        Analyze the logfile of a single analysis case
+        """
+        at, st, rc, hz, gm, dr = case
         path = (
             f"extra/structural_analysis/results/{at}_{st}_{rc}/"
             f"response_modal/{hz}/{gm}/log_{dr}"
         )
-        status = status_from_log(path)
-        start_time = get_logtime(path, 0)
-        end_time = get_logtime(path, -1)
-        sub = get_max_subdiv_reported(path)
+        return "-".join(case), analyze_log(path)
+
+    keys = []
+    vals: dict[str, list] = {'status': [], 'start_time': [], 'end_time': [], 'sub': []}
+    for key, (status, start_time, end_time, sub) in map(
+        analyze_case, product(atypes, stors, rcs, hzs, gms, ('x', 'y'))
+    ):
+        keys.append(key)
         vals['status'].append(status)
         vals['start_time'].append(start_time)
         vals['end_time'].append(end_time)
@@ -3,6 +3,7 @@ Equivalent 2D models of the archetypes considered in this study.
 
 """
 
+from copy import copy
 from copy import deepcopy
 import numpy as np
 import scipy as sp
@@ -40,6 +41,10 @@ from osmg.ops.uniaxial_material import Steel02
 # pylint:disable=consider-using-enumerate
 # pylint:disable=use-dict-literal
 
+# read-only zero offset, shared by all components without offsets
+_ZERO3 = np.zeros(3)
+_ZERO3.setflags(write=False)
+
 
 def generate_archetype(
     level_elevs,
@@ -87,6 +92,8 @@ def generate_archetype(
     """
 
     n_parameter = 10.00
+    # stiffness amplification of the elastic part of hinged members
+    stiffness_mod = (n_parameter + 1) / n_parameter
 
     df_smf = pd.read_csv(
         "extra/structural_analysis/data/brbf_stiffness_modification_factors.csv",
@@ -134,6 +141,19 @@ def generate_archetype(
     lateral_system, num_levels_str, risk_category = archetype.split("_")
     num_levels = int(num_levels_str)
 
+    # per-story quantities are stored in arrays indexed by
+    # level_counter (starting from zero)
+    level_tags = [f"level_{i + 1}" for i in range(num_levels)]
+    lvl_weight = np.array([lvl_weight[level_tag] for level_tag in level_tags])
+    beam_udls = np.array([beam_udls[level_tag] for level_tag in level_tags])
+
+    def story_array(key):
+        """
+        Cast a per-story metadata entry, keyed by story number, to an
+        array indexed by level_counter.
+        """
+        return np.array([metadata[key][i + 1] for i in range(num_levels)])
+
     # define the model
     mdl = Model("model")
     bcg = BeamColumnGenerator(mdl)
@@ -146,10 +166,13 @@ def generate_archetype(
     for i, height in enumerate(level_elevs):
         mdl.add_level(i + 1, height)
 
-    level_elevs = []
-    for level in mdl.levels.values():
-        level_elevs.append(level.elevation)
-    level_elevs = np.diff(level_elevs)
+    level_elevs = np.diff(
+        np.fromiter(
+            (level.elevation for level in mdl.levels.values()),
+            dtype=float,
+            count=len(mdl.levels),
+        )
+    )
     hi_diff = np.diff(np.array((0.00, *level_elevs)))
 
     defaults.load_default_steel(mdl)
@@ -171,29 +194,68 @@ def generate_archetype(
 
     steel_phys_mat = mdl.physical_materials.retrieve_by_attr("name", "default steel")
 
-    def flatten_dict(dictionary):
-        vals = []
-        for value in dictionary.values():
-            if isinstance(value, dict):
-                # recursively flatten the nested dictionary
-                vals.extend(flatten_dict(value))
-            else:
-                vals.append(value)
-        return vals
-
+    # collect the section names from the nested dictionary
     wsections = set()
     hss_secs = set()
-    for val in flatten_dict(sections):
-        if val.startswith("W"):
-            wsections.add(val)
-        elif val.startswith("H"):
-            hss_secs.add(val)
-        # else, it's probably a BRB area
+    stack = [sections]
+    while stack:
+        dictionary = stack.pop()
+        for val in dictionary.values():
+            if isinstance(val, dict):
+                stack.append(val)
+            elif val[:1] == "W":
+                wsections.add(val)
+            elif val[:1] == "H":
+                hss_secs.add(val)
+            # else, it's probably a BRB area
 
     section_type = ElasticSection
     element_type = ElasticBeamColumn
     sec_collection = mdl.elastic_sections
 
+    # Copies of sections with modified stiffness, shared by all
+    # elements using the same section and modification factors.
+    scaled_sections = {}
+
+    def scaled_section(sec, i_x_mod, i_y_mod=None, area_mod=1.00):
+        """
+        Return a copy of a section with its moments of inertia and
+        area multiplied by the given factors. The copy is created once
+        and reused. It is a shallow copy: only the scaled attributes
+        are rebound, and everything else is shared with the original
+        section.
+        """
+        if i_y_mod is None:
+            i_y_mod = i_x_mod
+        key = (id(sec), i_x_mod, i_y_mod, area_mod)
+        if key not in scaled_sections:
+            sec_cp = copy(sec)
+            sec_cp.i_x = sec.i_x * i_x_mod
+            sec_cp.i_y = sec.i_y * i_y_mod
+            sec_cp.area = sec.area * area_mod
+            scaled_sections[key] = sec_cp
+        return scaled_sections[key]
+
+    def imk_args(sec, lboverl, consider_composite, **kwargs):
+        """
+        Return the arguments of the IMK zero-length hinge generators
+        for a steel W section.
+        """
+        return {
+            "lboverl": lboverl,
+            "loverh": 0.50,
+            "rbs_factor": None,
+            "consider_composite": consider_composite,
+            "axial_load_ratio": 0.00,
+            "section": sec,
+            "n_parameter": n_parameter,
+            "physical_material": steel_phys_mat,
+            "distance": 0.01,
+            "n_sub": 1,
+            "element_type": TwoNodeLink,
+            **kwargs,
+        }
+
     for sec in wsections:
         secg.load_aisc_from_database(
             "W", [sec], "default steel", "default steel", section_type
@@ -203,9 +265,26 @@ def generate_archetype(
             "HSS_circ", [sec], "brace steel", "default steel", FiberSection
         )
 
+    # sections retrieved by name, since the same sections are looked
+    # up for every level and placement
+    retrieved_sections = {}
+
+    def retrieve_section(name):
+        """
+        Retrieve an elastic section by name.
+        """
+        if name not in retrieved_sections:
+            retrieved_sections[name] = sec_collection.retrieve_by_attr("name", name)
+        return retrieved_sections[name]
+
     x_grd_tags = ["LC", "G1", "G2", "1", "2", "3", "4", "5", "6", "7", "8"]
     x_grd_locs = np.linspace(0.00, len(x_grd_tags) * 25.00 * 12.00, len(x_grd_tags) + 1)
-    x_grd = {x_grd_tags[i]: x_grd_locs[i] for i in range(len(x_grd_tags))}
+    # (the last gridline location has no tag and is not used)
+    x_grd = dict(zip(x_grd_tags, x_grd_locs.tolist()))
+    # gridlines used outside of the per-placement loops
+    x_lc = x_grd["LC"]
+    x_g1 = x_grd["G1"]
+    x_g2 = x_grd["G2"]
 
     n_sub = 1  # linear elastic element subdivision
 
@@ -219,13 +298,22 @@ def generate_archetype(
         if no_llrs:
             raise ValueError('`no_LLRS=True` is only available for braced frames.')
 
+        # gridline coordinates of the ends of each frame bay
+        outer_bays = [
+            (x_grd[tag_i], x_grd[tag_j])
+            for tag_i, tag_j in zip(("1", "2", "3", "4"), ("2", "3", "4", "5"))
+        ]
+        inner_bays = [
+            (x_grd[tag_i], x_grd[tag_j]) for tag_i, tag_j in zip(("6", "7"), ("7", "8"))
+        ]
+
         for level_counter in range(num_levels):
             level_tag = f"level_{level_counter + 1}"
             mdl.levels.set_active([level_counter + 1])
 
             # add the lateral columns
-            beam_depth = sec_collection.retrieve_by_attr(
-                "name", sections["outer_frame"]["lateral_beams"][level_tag]
+            beam_depth = retrieve_section(
+                sections["outer_frame"]["lateral_beams"][level_tag]
             ).properties["d"]
 
             for plcmt_tag in ("1", "2", "3", "4", "5"):
@@ -238,13 +326,11 @@ def generate_archetype(
                 else:
                     placement = "interior"
                     pz_loc = "interior"
-                sec = sec_collection.retrieve_by_attr(
-                    "name",
-                    sections["outer_frame"]["lateral_cols"][placement][level_tag],
+                sec = retrieve_section(
+                    sections["outer_frame"]["lateral_cols"][placement][level_tag]
                 )
-                sec_cp = deepcopy(sec)
-                sec_cp.i_x *= (n_parameter + 1) / n_parameter
-                sec_cp.i_y *= (n_parameter + 1) / n_parameter
+                sec_cp = scaled_section(sec, stiffness_mod)
+                zl_args = imk_args(sec, 1.00, False)
 
                 column_depth = sec.properties["d"]
                 bcg.add_pz_active(
@@ -271,8 +357,8 @@ def generate_archetype(
                 bcg.add_vertical_active(
                     x_grd[plcmt_tag],
                     0.00,
-                    np.zeros(3),
-                    np.zeros(3),
+                    _ZERO3,
+                    _ZERO3,
                     col_gtransf,
                     n_sub,
                     sec_cp,
@@ -284,52 +370,25 @@ def generate_archetype(
                         "n_x": n_parameter,
                         "n_y": None,
                         "zerolength_gen_i": imk_6,
-                        "zerolength_gen_args_i": {
-                            "lboverl": 1.00,
-                            "loverh": 0.50,
-                            "rbs_factor": None,
-                            "consider_composite": False,
-                            "axial_load_ratio": 0.00,
-                            "section": sec,
-                            "n_parameter": n_parameter,
-                            "physical_material": steel_phys_mat,
-                            "distance": 0.01,
-                            "n_sub": 1,
-                            "element_type": TwoNodeLink,
-                        },
+                        "zerolength_gen_args_i": dict(zl_args),
                         "zerolength_gen_j": imk_6,
-                        "zerolength_gen_args_j": {
-                            "lboverl": 1.00,
-                            "loverh": 0.50,
-                            "rbs_factor": None,
-                            "consider_composite": False,
-                            "axial_load_ratio": 0.00,
-                            "section": sec,
-                            "n_parameter": n_parameter,
-                            "physical_material": steel_phys_mat,
-                            "distance": 0.01,
-                            "n_sub": 1,
-                            "element_type": TwoNodeLink,
-                        },
+                        "zerolength_gen_args_j": dict(zl_args),
                     },
                 )
 
             # add the lateral beams
-            sec = sec_collection.retrieve_by_attr(
-                "name", sections["outer_frame"]["lateral_beams"][level_tag]
-            )
-            sec_cp = deepcopy(sec)
-            sec_cp.i_x *= (n_parameter + 1) / n_parameter
-            sec_cp.i_y *= (n_parameter + 1) / n_parameter
+            sec = retrieve_section(sections["outer_frame"]["lateral_beams"][level_tag])
+            sec_cp = scaled_section(sec, stiffness_mod)
+            zl_args = imk_args(sec, 0.75, True)
 
-            for plcmt_i, plcmt_j in zip(("1", "2", "3", "4"), ("2", "3", "4", "5")):
+            for x_i, x_j in outer_bays:
                 bcg.add_horizontal_active(
-                    x_grd[plcmt_i],
+                    x_i,
                     0.00,
-                    x_grd[plcmt_j],
+                    x_j,
                     0.00,
-                    np.array((0.0, 0.0, 0.0)),
-                    np.array((0.0, 0.0, 0.0)),
+                    _ZERO3,
+                    _ZERO3,
                     "middle_back",
                     "middle_front",
                     "Linear",
@@ -342,33 +401,9 @@ def generate_archetype(
                         "n_x": n_parameter,
                         "n_y": None,
                         "zerolength_gen_i": imk_6,
-                        "zerolength_gen_args_i": {
-                            "lboverl": 0.75,
-                            "loverh": 0.50,
-                            "rbs_factor": None,
-                            "consider_composite": True,
-                            "section": sec,
-                            "n_parameter": n_parameter,
-                            "axial_load_ratio": 0.00,
-                            "physical_material": steel_phys_mat,
-                            "distance": 0.01,
-                            "n_sub": 1,
-                            "element_type": TwoNodeLink,
-                        },
+                        "zerolength_gen_args_i": dict(zl_args),
                         "zerolength_gen_j": imk_6,
-                        "zerolength_gen_args_j": {
-                            "lboverl": 0.75,
-                            "loverh": 0.50,
-                            "rbs_factor": None,
-                            "consider_composite": True,
-                            "axial_load_ratio": 0.00,
-                            "section": sec,
-                            "n_parameter": n_parameter,
-                            "physical_material": steel_phys_mat,
-                            "distance": 0.01,
-                            "n_sub": 1,
-                            "element_type": TwoNodeLink,
-                        },
+                        "zerolength_gen_args_j": dict(zl_args),
                     },
                 )
 
@@ -380,13 +415,11 @@ def generate_archetype(
                         placement = "exterior"
                     else:
                         placement = "interior"
-                    sec = sec_collection.retrieve_by_attr(
-                        "name",
-                        sections["inner_frame"]["lateral_cols"][placement][level_tag],
+                    sec = retrieve_section(
+                        sections["inner_frame"]["lateral_cols"][placement][level_tag]
                     )
-                    sec_cp = deepcopy(sec)
-                    sec_cp.i_x *= (n_parameter + 1) / n_parameter
-                    sec_cp.i_y *= (n_parameter + 1) / n_parameter
+                    sec_cp = scaled_section(sec, stiffness_mod)
+                    zl_args = imk_args(sec, 1.00, False)
                     column_depth = sec.properties["d"]
                     bcg.add_pz_active(
                         x_grd[plcmt_tag],
@@ -412,8 +445,8 @@ def generate_archetype(
                     bcg.add_vertical_active(
                         x_grd[plcmt_tag],
                         0.00,
-                        np.zeros(3),
-                        np.zeros(3),
+                        _ZERO3,
+                        _ZERO3,
                         col_gtransf,
                         n_sub,
                         sec_cp,
@@ -425,51 +458,26 @@ def generate_archetype(
                             "n_x": n_parameter,
                             "n_y": None,
                             "zerolength_gen_i": imk_6,
-                            "zerolength_gen_args_i": {
-                                "lboverl": 1.00,
-                                "loverh": 0.50,
-                                "rbs_factor": None,
-                                "consider_composite": False,
-                                "axial_load_ratio": 0.00,
-                                "section": sec,
-                                "n_parameter": n_parameter,
-                                "physical_material": steel_phys_mat,
-                                "distance": 0.01,
-                                "n_sub": 1,
-                                "element_type": TwoNodeLink,
-                            },
+                            "zerolength_gen_args_i": dict(zl_args),
                             "zerolength_gen_j": imk_6,
-                            "zerolength_gen_args_j": {
-                                "lboverl": 1.00,
-                                "loverh": 0.50,
-                                "rbs_factor": None,
-                                "consider_composite": False,
-                                "axial_load_ratio": 0.00,
-                                "section": sec,
-                                "n_parameter": n_parameter,
-                                "physical_material": steel_phys_mat,
-                                "distance": 0.01,
-                                "n_sub": 1,
-                                "element_type": TwoNodeLink,
-                            },
+                            "zerolength_gen_args_j": dict(zl_args),
                         },
                     )
 
                 # inner frame beams
-                sec = sec_collection.retrieve_by_attr(
-                    "name", sections["inner_frame"]["lateral_beams"][level_tag]
+                sec = retrieve_section(
+                    sections["inner_frame"]["lateral_beams"][level_tag]
                 )
-                sec_cp = deepcopy(sec)
-                sec_cp.i_x *= (n_parameter + 1) / n_parameter
-                sec_cp.i_y *= (n_parameter + 1) / n_parameter
-                for plcmt_i, plcmt_j in zip(("6", "7"), ("7", "8")):
+                sec_cp = scaled_section(sec, stiffness_mod)
+                zl_args = imk_args(sec, 0.75, True)
+                for x_i, x_j in inner_bays:
                     bcg.add_horizontal_active(
-                        x_grd[plcmt_i],
+                        x_i,
                         0.00,
-                        x_grd[plcmt_j],
+                        x_j,
                         0.00,
-                        np.array((0.0, 0.0, 0.0)),
-                        np.array((0.0, 0.0, 0.0)),
+                        _ZERO3,
+                        _ZERO3,
                         "middle_back",
                         "middle_front",
                         "Linear",
@@ -482,33 +490,9 @@ def generate_archetype(
                             "n_x": n_parameter,
                             "n_y": None,
                             "zerolength_gen_i": imk_6,
-                            "zerolength_gen_args_i": {
-                                "lboverl": 0.75,
-                                "loverh": 0.50,
-                                "rbs_factor": None,
-                                "consider_composite": True,
-                                "axial_load_ratio": 0.00,
-                                "section": sec,
-                                "n_parameter": n_parameter,
-                                "physical_material": steel_phys_mat,
-                                "distance": 0.01,
-                                "n_sub": 1,
-                                "element_type": TwoNodeLink,
-                            },
+                            "zerolength_gen_args_i": dict(zl_args),
                             "zerolength_gen_j": imk_6,
-                            "zerolength_gen_args_j": {
-                                "lboverl": 0.75,
-                                "loverh": 0.50,
-                                "rbs_factor": None,
-                                "consider_composite": True,
-                                "axial_load_ratio": 0.00,
-                                "section": sec,
-                                "n_parameter": n_parameter,
-                                "physical_material": steel_phys_mat,
-                                "distance": 0.01,
-                                "n_sub": 1,
-                                "element_type": TwoNodeLink,
-                            },
+                            "zerolength_gen_args_j": dict(zl_args),
                         },
                     )
 
@@ -516,54 +500,65 @@ def generate_archetype(
 
     elif lateral_system in ("scbf", "brbf"):
         if lateral_system == "scbf":
-            brace_lens = metadata["brace_buckling_length"]
-            brace_l_c = metadata["brace_l_c"]
-            gusset_t_p = metadata["gusset_t_p"]
-            gusset_avg_buckl_len = metadata["gusset_avg_buckl_len"]
-            hinge_dist = metadata["hinge_dist"]
+            brace_lens = story_array("brace_buckling_length")
+            brace_l_c = story_array("brace_l_c")
+            gusset_t_p = story_array("gusset_t_p")
+            gusset_avg_buckl_len = story_array("gusset_avg_buckl_len")
+            hinge_dist = story_array("hinge_dist")
 
-        plate_a = metadata["plate_a"]
-        plate_b = metadata["plate_b"]
+        plate_a = story_array("plate_a")
+        plate_b = story_array("plate_b")
 
-        sec = sec_collection.retrieve_by_attr(
-            "name", sections["lateral_beams"]["level_1"]
+        # (the first story's offset is repeated for the base)
+        beam_offsets = np.fromiter(
+            (
+                -retrieve_section(sections["lateral_beams"][level_tag]).properties["d"]
+                / 2.00
+                for level_tag in level_tags
+            ),
+            dtype=float,
+            count=num_levels,
+        )
+        vertical_offsets = np.concatenate((beam_offsets[:1], beam_offsets))
+
+        # The chevron braces alternate direction between stories, so
+        # the layout of each story only depends on the parity of its
+        # index (0 on the first story, 1 on the second, and so on).
+        # gridlines with panel zones, by parity
+        pz_plcmts = (("1", "3"), ("2",))
+        # (snap_i, snap_j, plate_a factor i, plate_a factor j) for
+        # the two beam placements, by parity
+        beam_cfg = (
+            (
+                ("middle_back", "top_center", 0.00, -0.75),
+                ("bottom_center", "middle_front", +0.75, 0.00),
+            ),
+            (
+                ("bottom_center", "middle_front", +0.75, 0.00),
+                ("middle_back", "top_center", 0.00, -0.75),
+            ),
+        )
+        # (i, j) gridlines of the two braces, by parity
+        brace_plcmts = (
+            (("2", "1"), ("2", "3")),
+            (("1", "2"), ("3", "2")),
         )
-        vertical_offsets = [-sec.properties["d"] / 2.00]
-        for level_counter in range(num_levels):
-            level_tag = f"level_{level_counter + 1}"
-            sec = sec_collection.retrieve_by_attr(
-                "name", sections["lateral_beams"][f"level_{level_counter + 1}"]
-            )
-            vertical_offsets.append(-sec.properties["d"] / 2.00)
 
         # frame columns
         for level_counter in range(num_levels):
             level_tag = f"level_{level_counter + 1}"
-            if level_counter % 2 == 0:
-                even_story_num = False  # (odd because of zero-indexing)
-            else:
-                even_story_num = True
+            parity = level_counter % 2
             mdl.levels.set_active([level_counter + 1])
-            sec = sec_collection.retrieve_by_attr(
-                "name", sections["lateral_cols"][level_tag]
-            )
-            sec_cp = deepcopy(sec)
-            sec_cp.i_x *= (n_parameter + 1) / n_parameter
-            sec_cp.i_y *= (n_parameter + 1) / n_parameter
+            sec = retrieve_section(sections["lateral_cols"][level_tag])
+            sec_cp = scaled_section(sec, stiffness_mod)
+            zl_args = imk_args(sec, 1.00, False)
             column_depth = sec.properties["d"]
-            beam_depth = sec_collection.retrieve_by_attr(
-                "name", sections["lateral_beams"][level_tag]
+            beam_depth = retrieve_section(
+                sections["lateral_beams"][level_tag]
             ).properties["d"]
-            for plcmt in ("1", "2", "3"):
-                x_coord = x_grd[plcmt]
-                if not even_story_num:
-                    if plcmt == "2":
-                        continue
-                else:
-                    if plcmt in ("1", "3"):
-                        continue
+            for plcmt in pz_plcmts[parity]:
                 bcg.add_pz_active(
-                    x_coord,
+                    x_grd[plcmt],
                     0.00,
                     sec,
                     steel_phys_mat,
@@ -583,20 +578,12 @@ def generate_archetype(
                 )
             for plcmt in ("1", "2", "3"):
                 x_coord = x_grd[plcmt]
-                if not even_story_num:
-                    if plcmt == "2":
-                        top_offset = -beam_depth - plate_b[level_counter + 1]
-                        bot_offset = 0.00
-                    else:
-                        top_offset = 0.00
-                        bot_offset = +plate_b[level_counter + 1]
+                if plcmt in pz_plcmts[parity]:
+                    top_offset = 0.00
+                    bot_offset = +plate_b[level_counter]
                 else:
-                    if plcmt in ("1", "3"):
-                        top_offset = -beam_depth - plate_b[level_counter + 1]
-                        bot_offset = 0.00
-                    else:
-                        top_offset = 0.00
-                        bot_offset = +plate_b[level_counter + 1]
+                    top_offset = -beam_depth - plate_b[level_counter]
+                    bot_offset = 0.00
                 bcg.add_vertical_active(
                     x_coord,
                     0.00,
@@ -613,84 +600,29 @@ def generate_archetype(
                         "n_x": n_parameter,
                         "n_y": None,
                         "zerolength_gen_i": imk_6,
-                        "zerolength_gen_args_i": {
-                            "lboverl": 1.00,
-                            "loverh": 0.50,
-                            "rbs_factor": None,
-                            "consider_composite": False,
-                            "axial_load_ratio": 0.00,
-                            "section": sec,
-                            "n_parameter": n_parameter,
-                            "physical_material": steel_phys_mat,
-                            "distance": 0.01,
-                            "n_sub": 1,
-                            "element_type": TwoNodeLink,
-                        },
+                        "zerolength_gen_args_i": dict(zl_args),
                         "zerolength_gen_j": imk_6,
-                        "zerolength_gen_args_j": {
-                            "lboverl": 1.00,
-                            "loverh": 0.50,
-                            "rbs_factor": None,
-                            "consider_composite": False,
-                            "axial_load_ratio": 0.00,
-                            "section": sec,
-                            "n_parameter": n_parameter,
-                            "physical_material": steel_phys_mat,
-                            "distance": 0.01,
-                            "n_sub": 1,
-                            "element_type": TwoNodeLink,
-                        },
+                        "zerolength_gen_args_j": dict(zl_args),
                     },
                 )
 
         # frame beams
         for level_counter in range(num_levels):
             level_tag = f"level_{level_counter + 1}"
-            if level_counter % 2 == 0:
-                even_story_num = False  # (odd because of zero-indexing)
-            else:
-                even_story_num = True
+            parity = level_counter % 2
             mdl.levels.set_active([level_counter + 1])
-            sec = sec_collection.retrieve_by_attr(
-                "name", sections["lateral_beams"][level_tag]
-            )
-            sec_cp = deepcopy(sec)
-            sec_cp.i_x *= (n_parameter + 1) / n_parameter
-            sec_cp.i_y *= (n_parameter + 1) / n_parameter
+            sec = retrieve_section(sections["lateral_beams"][level_tag])
+            sec_cp = scaled_section(sec, stiffness_mod)
+            zl_args = imk_args(sec, 0.75, True)
 
-            for plcmt_tag_i, plcmt_tag_j in zip(("1", "2"), ("2", "3")):
+            for (plcmt_tag_i, plcmt_tag_j), cfg in zip(
+                (("1", "2"), ("2", "3")), beam_cfg[parity]
+            ):
                 plcmt_i = x_grd[plcmt_tag_i]
                 plcmt_j = x_grd[plcmt_tag_j]
-                if not even_story_num:
-                    if plcmt_tag_i == "1":
-                        snap_i = "middle_back"
-                        snap_j = "top_center"
-                        offset_i = np.zeros(3)
-                        offset_j = np.array(
-                            (-0.75 * plate_a[level_counter + 1], 0.00, 0.00)
-                        )
-                    else:
-                        snap_i = "bottom_center"
-                        snap_j = "middle_front"
-                        offset_i = np.array(
-                            (+0.75 * plate_a[level_counter + 1], 0.00, 0.00)
-                        )
-                        offset_j = np.zeros(3)
-                else:
-                    if plcmt_tag_i == "1":
-                        snap_i = "bottom_center"
-                        snap_j = "middle_front"
-                        offset_i = np.array(
-                            (+0.75 * plate_a[level_counter + 1], 0.00, 0.00)
-                        )
-                        offset_j = np.zeros(3)
-                    else:
-                        snap_i = "middle_back"
-                        snap_j = "top_center"
-                        offset_i = np.zeros(3)
-                        offset_j = np.array(
-                            (-0.75 * plate_a[level_counter + 1], 0.00, 0.00)
-                        )
+                snap_i, snap_j, fac_i, fac_j = cfg
+                offset_i = np.array((fac_i * plate_a[level_counter], 0.00, 0.00))
+                offset_j = np.array((fac_j * plate_a[level_counter], 0.00, 0.00))
 
                 bcg.add_horizontal_active(
                     plcmt_i,
@@ -711,68 +643,46 @@ def generate_archetype(
                         "n_x": n_parameter,
                         "n_y": None,
                         "zerolength_gen_i": imk_6,
-                        "zerolength_gen_args_i": {
-                            "lboverl": 0.75,
-                            "loverh": 0.50,
-                            "rbs_factor": None,
-                            "consider_composite": True,
-                            "axial_load_ratio": 0.00,
-                            "section": sec,
-                            "n_parameter": n_parameter,
-                            "physical_material": steel_phys_mat,
-                            "distance": 0.01,
-                            "n_sub": 1,
-                            "element_type": TwoNodeLink,
-                        },
+                        "zerolength_gen_args_i": dict(zl_args),
                         "zerolength_gen_j": imk_6,
-                        "zerolength_gen_args_j": {
-                            "lboverl": 0.75,
-                            "loverh": 0.50,
-                            "rbs_factor": None,
-                            "consider_composite": True,
-                            "axial_load_ratio": 0.00,
-                            "section": sec,
-                            "n_parameter": n_parameter,
-                            "physical_material": steel_phys_mat,
-                            "distance": 0.01,
-                            "n_sub": 1,
-                            "element_type": TwoNodeLink,
-                        },
+                        "zerolength_gen_args_j": dict(zl_args),
                     },
                 )
         # braces
         brace_subdiv = 8
+        brace_phys_mat = deepcopy(steel_phys_mat)
+        brace_phys_mat.f_y = 50.4 * 1000.00  # for round HSS
         for level_counter in range(num_levels):
             level_tag = f"level_{level_counter + 1}"
-            if level_counter % 2 == 0:
-                even_story_num = False  # (odd because of zero-indexing)
-            else:
-                even_story_num = True
+            parity = level_counter % 2
             mdl.levels.set_active([level_counter + 1])
             brace_sec_name = sections["braces"][level_tag]
 
-            for plcmt_i, plcmt_j in zip(("2", "2"), ("1", "3")):
-                if not even_story_num:
-                    x_i = x_grd[plcmt_i]
-                    x_j = x_grd[plcmt_j]
-                else:
-                    x_i = x_grd[plcmt_j]
-                    x_j = x_grd[plcmt_i]
+            for plcmt_i, plcmt_j in brace_plcmts[parity]:
+                x_i = x_grd[plcmt_i]
+                x_j = x_grd[plcmt_j]
 
                 if lateral_system == "scbf":
                     brace_sec = mdl.fiber_sections.retrieve_by_attr(
                         "name", brace_sec_name
                     )
 
-                    brace_phys_mat = deepcopy(steel_phys_mat)
-                    brace_phys_mat.f_y = 50.4 * 1000.00  # for round HSS
                     brace_mat = mtlg.generate_steel_hss_circ_brace_fatigue_mat(
-                        brace_sec, brace_phys_mat, brace_lens[level_counter + 1]
+                        brace_sec, brace_phys_mat, brace_lens[level_counter]
                     )
 
                     bsec = brace_sec.copy_alter_material(
                         brace_mat, mdl.uid_generator.new("section")
                     )
+                    gusset_args = {
+                        "distance": hinge_dist[level_counter],
+                        "element_type": TwoNodeLink,
+                        "physical_mat": steel_phys_mat,
+                        "d_brace": bsec.properties["OD"],
+                        "l_c": brace_l_c[level_counter],
+                        "t_p": gusset_t_p[level_counter],
+                        "l_b": gusset_avg_buckl_len[level_counter],
+                    }
 
                     if not no_llrs:
                         bcg.add_diagonal_active(
@@ -799,25 +709,9 @@ def generate_archetype(
                                 "n_x": None,
                                 "n_y": None,
                                 "zerolength_gen_i": steel_brace_gusset,
-                                "zerolength_gen_args_i": {
-                                    "distance": hinge_dist[level_counter + 1],
-                                    "element_type": TwoNodeLink,
-                                    "physical_mat": steel_phys_mat,
-                                    "d_brace": bsec.properties["OD"],
-                                    "l_c": brace_l_c[level_counter + 1],
-                                    "t_p": gusset_t_p[level_counter + 1],
-                                    "l_b": gusset_avg_buckl_len[level_counter + 1],
-                                },
+                                "zerolength_gen_args_i": dict(gusset_args),
                                 "zerolength_gen_j": steel_brace_gusset,
-                                "zerolength_gen_args_j": {
-                                    "distance": hinge_dist[level_counter + 1],
-                                    "element_type": TwoNodeLink,
-                                    "physical_mat": steel_phys_mat,
-                                    "d_brace": bsec.properties["OD"],
-                                    "l_c": brace_l_c[level_counter + 1],
-                                    "t_p": gusset_t_p[level_counter + 1],
-                                    "l_b": gusset_avg_buckl_len[level_counter + 1],
-                                },
+                                "zerolength_gen_args_j": dict(gusset_args),
                             },
                         )
 
@@ -865,27 +759,18 @@ def generate_archetype(
                 placement = "exterior"
                 moment_mod = grav_col_moment_mod_exterior
             if lateral_system == "smrf":
-                sec = sec_collection.retrieve_by_attr(
-                    "name",
-                    sections["outer_frame"]["lateral_cols"][placement][level_tag],
+                sec = retrieve_section(
+                    sections["outer_frame"]["lateral_cols"][placement][level_tag]
                 )
             else:
-                sec = sec_collection.retrieve_by_attr(
-                    "name", sections["lateral_cols"][level_tag]
-                )
-            sec_cp = deepcopy(sec)
-            sec_cp.i_x *= (
-                (n_parameter + 1) / n_parameter * moment_mod * grav_bm_moment_mod
-            )
-            sec_cp.i_y *= (
-                (n_parameter + 1) / n_parameter * moment_mod * grav_bm_moment_mod
-            )
-            sec_cp.area *= moment_mod
+                sec = retrieve_section(sections["lateral_cols"][level_tag])
+            inertia_mod = stiffness_mod * moment_mod * grav_bm_moment_mod
+            sec_cp = scaled_section(sec, inertia_mod, inertia_mod, moment_mod)
             bcg.add_vertical_active(
                 x_grd[plcmt_tag],
                 0.00,
-                np.zeros(3),
-                np.zeros(3),
+                _ZERO3,
+                _ZERO3,
                 col_gtransf,
                 n_sub,
                 sec_cp,
@@ -899,38 +784,33 @@ def generate_archetype(
                     "zerolength_gen_i": None,
                     "zerolength_gen_args_i": {},
                     "zerolength_gen_j": imk_56,
-                    "zerolength_gen_args_j": {
-                        "lboverl": 1.00,
-                        "loverh": 0.50,
-                        "rbs_factor": None,
-                        "consider_composite": False,
-                        "axial_load_ratio": 0.00,
-                        "section": sec,
-                        "n_parameter": n_parameter,
-                        "physical_material": steel_phys_mat,
-                        "distance": 0.01,
-                        "n_sub": 1,
-                        "element_type": TwoNodeLink,
-                        "moment_modifier": moment_mod,
-                    },
+                    "zerolength_gen_args_j": imk_args(
+                        sec, 1.00, False, moment_modifier=moment_mod
+                    ),
                 },
             )
 
         # add the gravity beams
-        sec = sec_collection.retrieve_by_attr(
-            "name", sections["gravity_beams"][level_tag]
-        )
+        sec = retrieve_section(sections["gravity_beams"][level_tag])
         moment_mod = grav_bm_moment_mod
-        sec_cp = deepcopy(sec)
-        sec_cp.i_x *= (n_parameter + 1) / n_parameter * moment_mod
-        sec_cp.area *= moment_mod
+        sec_cp = scaled_section(sec, stiffness_mod * moment_mod, 1.00, moment_mod)
+        shear_tab_args = {
+            "consider_composite": True,
+            "section": sec,
+            "n_parameter": n_parameter,
+            "physical_material": steel_phys_mat,
+            "distance": 0.01,
+            "n_sub": 1,
+            "moment_modifier": moment_mod,
+            "element_type": TwoNodeLink,
+        }
         bcg.add_horizontal_active(
-            x_grd["G1"],
+            x_g1,
             0.00,
-            x_grd["G2"],
+            x_g2,
             0.00,
-            np.array((0.0, 0.0, 0.0)),
-            np.array((0.0, 0.0, 0.0)),
+            _ZERO3,
+            _ZERO3,
             "centroid",
             "centroid",
             "Linear",
@@ -943,27 +823,9 @@ def generate_archetype(
                 "n_x": n_parameter,
                 "n_y": None,
                 "zerolength_gen_i": gravity_shear_tab,
-                "zerolength_gen_args_i": {
-                    "consider_composite": True,
-                    "section": sec,
-                    "n_parameter": n_parameter,
-                    "physical_material": steel_phys_mat,
-                    "distance": 0.01,
-                    "n_sub": 1,
-                    "moment_modifier": moment_mod,
-                    "element_type": TwoNodeLink,
-                },
+                "zerolength_gen_args_i": dict(shear_tab_args),
                 "zerolength_gen_j": gravity_shear_tab,
-                "zerolength_gen_args_j": {
-                    "consider_composite": True,
-                    "section": sec,
-                    "n_parameter": n_parameter,
-                    "physical_material": steel_phys_mat,
-                    "distance": 0.01,
-                    "n_sub": 1,
-                    "moment_modifier": moment_mod,
-                    "element_type": TwoNodeLink,
-                },
+                "zerolength_gen_args_j": dict(shear_tab_args),
             },
         )
 
@@ -977,15 +839,15 @@ def generate_archetype(
 
     for level_counter in range(num_levels):
         col_assembly = trg.add(
-            x_grd["LC"],
+            x_lc,
             0.00,
             level_counter + 1,
-            np.array((0.00, 0.00, 0.00)),
+            _ZERO3,
             "centroid",
-            x_grd["LC"],
+            x_lc,
             0.00,
             level_counter,
-            np.array((0.00, 0.00, 0.00)),
+            _ZERO3,
             "centroid",
             "Corotational",
             area=1.00,
@@ -1000,15 +862,15 @@ def generate_archetype(
         if no_diaphragm:
             # note required: taken care of by rigid diaphragm constraint.
             trg.add(
-                x_grd["LC"],
+                x_lc,
                 0.00,
                 level_counter + 1,
-                np.array((0.00, 0.00, 0.00)),
+                _ZERO3,
                 "centroid",
-                x_grd["G1"],
+                x_g1,
                 0.00,
                 level_counter + 1,
-                np.array((0.00, 0.00, 0.00)),
+                _ZERO3,
                 "centroid",
                 "Linear",
                 area=1.00,
@@ -1017,15 +879,15 @@ def generate_archetype(
                 weight_per_length=0.00,
             )
             trg.add(
-                x_grd["G2"],
+                x_g2,
                 0.00,
                 level_counter + 1,
-                np.array((0.00, 0.00, 0.00)),
+                _ZERO3,
                 "centroid",
                 x_grd["1"],
                 0.00,
                 level_counter + 1,
-                np.array((0.00, 0.00, 0.00)),
+                _ZERO3,
                 "centroid",
                 "Linear",
                 area=1.00,
@@ -1038,12 +900,12 @@ def generate_archetype(
                     x_grd["5"],
                     0.00,
                     level_counter + 1,
-                    np.array((0.00, 0.00, 0.00)),
+                    _ZERO3,
                     "centroid",
                     x_grd["6"],
                     0.00,
                     level_counter + 1,
-                    np.array((0.00, 0.00, 0.00)),
+                    _ZERO3,
                     "centroid",
                     "Linear",
                     area=1.00,
@@ -1053,9 +915,8 @@ def generate_archetype(
                 )
 
     # retrieve primary nodes (from the leaning column)
-    p_nodes = []
-    for i in range(num_levels + 1):
-        p_nodes.append(query.search_node_lvl(x_grd["LC"], 0.00, i))
+    search_node_lvl = query.search_node_lvl
+    p_nodes = [search_node_lvl(x_lc, 0.00, i) for i in range(num_levels + 1)]
 
     # fix base
     for node in mdl.levels[0].nodes.values():
@@ -1073,30 +934,30 @@ def generate_archetype(
     else:
         raise ValueError(f"Invalid system: {lateral_system}")
 
-    for level_counter in range(1, num_levels + 1):
-        level_tag = "level_" + str(level_counter)
-        for xpt_tag in xpt_tags:
-            xpt = x_grd[xpt_tag] + 12.00 * 12.00
-            comp = query.retrieve_component(xpt, 0.00, level_counter)
+    xpts = [x_grd[xpt_tag] + 12.00 * 12.00 for xpt_tag in xpt_tags]
+    udl_vecs = np.zeros((num_levels, 3))
+    udl_vecs[:, 2] = -beam_udls
+    retrieve_component = query.retrieve_component
+    line_element_udl = loadcase.line_element_udl
+    # (the UDL is only applied to the elastic part of the beams, not
+    # to the hinges)
+    udl_elm_type = ElasticBeamColumn
+    for level_counter, udl_vec in enumerate(udl_vecs, start=1):
+        for xpt in xpts:
+            comp = retrieve_component(xpt, 0.00, level_counter)
             assert comp
             for elm in comp.elements.values():
-                if isinstance(elm, ElasticBeamColumn):
-                    loadcase.line_element_udl[elm.uid].add_glob(
-                        np.array((0.00, 0.00, -beam_udls[level_tag]))
-                    )
+                if isinstance(elm, udl_elm_type):
+                    line_element_udl[elm.uid].add_glob(udl_vec)
 
     # apply primary node load and mass
-    for i, p_node in enumerate(p_nodes):
-        if i == 0:
-            continue
-        level_tag = "level_" + str(i)
-        loadcase.node_loads[p_node.uid].val += np.array(
-            (0.00, 0.00, -lvl_weight[level_tag], 0.00, 0.00, 0.00)
-        )
-        mass = lvl_weight[level_tag] / G_CONST_IMPERIAL
-        loadcase.node_mass[p_node.uid].val += np.array(
-            (mass, 0.00, 0.00, 0.00, 0.00, 0.00)
-        )
+    load_vecs = np.zeros((num_levels, 6))
+    load_vecs[:, 2] = -lvl_weight
+    mass_vecs = np.zeros((num_levels, 6))
+    mass_vecs[:, 0] = lvl_weight / G_CONST_IMPERIAL
+    for p_node, load_vec, mass_vec in zip(p_nodes[1:], load_vecs, mass_vecs):
+        loadcase.node_loads[p_node.uid].val += load_vec
+        loadcase.node_mass[p_node.uid].val += mass_vec
 
     if not no_diaphragm:
         # assign rigid diaphragm constraints
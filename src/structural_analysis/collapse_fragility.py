@@ -3,13 +3,18 @@ Use analysis results to derive the collapse fragility of each
 archetype
 """
 
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 from scipy.special import binom
+from scipy.special import log_ndtr
 from scipy.stats import norm
 from scipy.optimize import minimize
 from scipy.interpolate import interp1d
 import matplotlib.pyplot as plt
+from extra.structural_analysis.src.util import binary_copy_is_current
 from extra.structural_analysis.src.util import read_study_param
 
 
@@ -17,50 +22,73 @@ def process_response(filepath):
     """
     Process the response file
     """
-    df = pd.read_parquet(filepath)
+    # Only the peak interstory drift columns are read. The MultiIndex
+    # columns are stored with their tuples as field names.
+    pid_columns = [
+        name for name in pq.read_schema(filepath).names if name.startswith("('PID',")
+    ]
+    df = pd.read_parquet(filepath, columns=pid_columns)
     df.columns.names = ("edp", "location", "direction")
 
     num_runs = len(df)
 
     drift_threshold = 0.06
 
-    collapse = df["PID"].max(axis=1) > drift_threshold
-
-    collapse_idx = collapse[collapse == True].index
-    num_collapse = len(collapse_idx)
+    # (fmax skips missing values, like DataFrame.max)
+    peak_drift = np.fmax.reduce(df["PID"].to_numpy(), axis=1)
+    num_collapse = int(np.count_nonzero(peak_drift > drift_threshold))
 
     return num_collapse, num_runs
 
 
+UHS_PATH = "extra/structural_analysis/results/site_hazard/UHS"
+
+
+@lru_cache(maxsize=1)
+def read_uhs_spectra():
+    """
+    Read all target spectra from the binary file written by
+    `site_hazard`.
+    """
+    return pd.read_parquet(f"{UHS_PATH}.parquet")
+
+
 def get_sa(hz, base_period):
     """
     Read a target spectrum from a file.
     """
     # determine Sa at those levels
-    spectrum = pd.read_csv(
-        f"extra/structural_analysis/results/site_hazard/UHS_{hz}.csv",
-        index_col=0,
-        header=0,
-    )
+    # (the binary file is used only if it is not older than the CSV
+    # file, like the hazard curves in `interp_uhs`)
+    csv_path = f"{UHS_PATH}_{hz}.csv"
+    if binary_copy_is_current(f"{UHS_PATH}.parquet", csv_path):
+        spectrum = read_uhs_spectra()[[f"{hz}"]]
+    else:
+        spectrum = pd.read_csv(csv_path, index_col=0, header=0)
 
     ifun = interp1d(spectrum.index.to_numpy(), spectrum.to_numpy().reshape(-1))
     current_sa = float(ifun(base_period))
     return current_sa
 
 
-def neg_log_likelihood(x, njs, zjs, xjs):
+def neg_log_likelihood(x, njs, zjs, log_xjs, log_binom):
     """
     Calculates the negative log likelihood of observing the given data
-    under the specified distribution parameters
+    under the specified distribution parameters, and its gradient.
+    `log_xjs` are the logarithms of the intensity levels and
+    `log_binom` is the sum of the logarithms of the binomial
+    coefficients, which do not depend on the parameters.
     """
     theta, beta = x
-    phi = norm.cdf(np.log(xjs / theta) / beta)
-    logl = np.sum(
-        np.log(binom(njs, zjs))
-        + zjs * np.log(phi)
-        + (njs - zjs) * np.log(1.00 - phi)
-    )
-    return -logl
+    u = (log_xjs - np.log(theta)) / beta
+    log_phi = log_ndtr(u)
+    log_phi_c = log_ndtr(-u)
+    log_pdf = -0.5 * u * u - 0.5 * np.log(2.00 * np.pi)
+    logl = log_binom + zjs @ log_phi + (njs - zjs) @ log_phi_c
+    dlogl_du = zjs * np.exp(log_pdf - log_phi)
+    dlogl_du -= (njs - zjs) * np.exp(log_pdf - log_phi_c)
+    grad = np.array((np.sum(dlogl_du) / (theta * beta), dlogl_du @ u / beta))
+    return -logl, grad
 
 
 def main():
@@ -77,12 +105,10 @@ def main():
         for x in range(num_hz)
     ]
 
-    zjs = []
-    njs = []
-    for filepath in filepaths:
-        z, n = process_response(filepath)
-        zjs.append(z)
-        njs.append(n)
+    # the response files are read concurrently, since parquet reading
+    # and the reductions release the GIL
+    with ThreadPoolExecutor(max_workers=min(len(filepaths), 8)) as executor:
+        zjs, njs = zip(*executor.map(process_response, filepaths))
     xjs = []
     for hz in [f"{i + 1}" for i in range(num_hz)]:
         xjs.append(get_sa(hz, base_period))
@@ -90,15 +116,18 @@ def main():
     zjs = np.array(zjs, dtype=float)
     njs = np.array(njs, dtype=float)
     xjs = np.array(xjs, dtype=float)
+    log_xjs = np.log(xjs)
+    log_binom = float(np.sum(np.log(binom(njs, zjs))))
 
     x0 = np.array((3.00, 0.40))
 
     res = minimize(
         neg_log_likelihood,
         x0,
-        method="nelder-mead",
-        args=(njs, zjs, xjs),
-        bounds=((0.0, 20.00), (0.20, 0.90)),
+        method="L-BFGS-B",
+        jac=True,
+        args=(njs, zjs, log_xjs, log_binom),
+        bounds=((0.01, 20.00), (0.20, 0.90)),
     )
 
     median = res.x[0]
@@ -2,7 +2,7 @@
 Extract EDPs from sqlite database and store them in parquet files
 """
 
-from tqdm import tqdm
+import numpy as np
 import pandas as pd
 from extra.structural_analysis.src.db import DB_Handler
 
@@ -30,15 +30,35 @@ def main():
     #             db_handler.delete_record(rrep)
     # # Note: Check for repeated results once again.
 
-    dfs = {}
-    for identifier in tqdm(identifiers):
-        df, _, _ = db_handler.retrieve_data(identifier)
-        dfs[identifier] = df
+    retrieved = db_handler.retrieve_data_bulk(identifiers)
+    dfs = {identifier: retrieved[identifier] for identifier in identifiers}
+    del retrieved
 
     # pylint: disable=consider-iterating-dictionary
-    merged_df = pd.concat(
-        dfs.values(), keys=[tuple(x.split('::')) for x in dfs.keys()]
-    )
+    keys = pd.MultiIndex.from_tuples([tuple(x.split('::')) for x in dfs.keys()])
+    template = next(iter(dfs.values())).index
+    if all(df.index.equals(template) for df in dfs.values()):
+        # All records have the same EDPs, so the values are copied in
+        # a preallocated buffer and the index is built once.
+        num_edps = len(template)
+        values = np.empty(len(dfs) * num_edps)
+        for i, df in enumerate(dfs.values()):
+            values[i * num_edps : (i + 1) * num_edps] = df.to_numpy()
+        merged_df = pd.Series(
+            values,
+            index=pd.MultiIndex.from_arrays(
+                [
+                    np.repeat(keys.get_level_values(k), num_edps)
+                    for k in range(keys.nlevels)
+                ]
+                + [
+                    np.tile(template.get_level_values(k), len(dfs))
+                    for k in range(template.nlevels)
+                ]
+            ),
+        )
+    else:
+        merged_df = pd.concat(dfs.values(), keys=keys)
 
     merged_df.index.names = [
         'archetype',
@@ -66,17 +86,19 @@ def main():
         "required_records_and_scaling_factors_cs.csv",
         index_col=[0, 1, 2],
     )
-    rsns = []
-    scaling_factors = []
-    for idx in merged_df.index:
-        archetype, hazard_level, gm, _, _, _ = idx
-        rsn = int(df_records.at[(archetype, f"hz_{hazard_level}", "RSN"), gm])
-        scaling = df_records.at[(archetype, f"hz_{hazard_level}", "SF"), gm]
-        rsns.append(rsn)
-        scaling_factors.append(scaling)
+    # one row per (archetype, hz, gm), with `RSN` and `SF` columns
+    df_records = df_records.stack().unstack(2)
+    record_keys = pd.MultiIndex.from_arrays(
+        [
+            merged_df.index.get_level_values('archetype'),
+            'hz_' + merged_df.index.get_level_values('hz'),
+            merged_df.index.get_level_values('gm'),
+        ]
+    )
+    matched = df_records.loc[record_keys]
 
-    merged_df['rsn'] = rsns
-    merged_df['scaling_factor'] = scaling_factors
+    merged_df['rsn'] = matched['RSN'].to_numpy().astype(int)
+    merged_df['scaling_factor'] = matched['SF'].to_numpy()
     merged_df.to_parquet('data/edp_results_0_cs.parquet')
 
 
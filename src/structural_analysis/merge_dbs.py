@@ -8,25 +8,44 @@ import os
 import sqlite3
 import glob
 from tqdm import tqdm
+from extra.structural_analysis.src.db import DB_Handler
 
 
 target_db = 'results.sqlite'
 
-# Connect to the main database
-conn = sqlite3.connect(target_db)
+# Bring the schema up to date so that `SELECT *` lines up
+DB_Handler(db_path=target_db, wal=True).close()
+
+# Connect to the main database. Transactions are managed explicitly.
+conn = sqlite3.connect(target_db, isolation_level=None)
 cursor = conn.cursor()
+cursor.execute("PRAGMA temp_store = MEMORY")
 
 # Find all SQLite files in the specified directory with the pattern results_*.sqlite
 db_files = glob.glob("results_*.sqlite")
 
-for db_file in tqdm(db_files):
-    cursor.execute(f"ATTACH DATABASE '{db_file}' AS toMerge")
-    conn.commit()
-    cursor.execute("INSERT INTO results_table SELECT * FROM toMerge.results_table")
-    conn.commit()
-    cursor.execute("DETACH DATABASE toMerge")
-    conn.commit()
-    os.remove(db_file)
+# SQLite can only attach a limited number of databases at once (10
+# by default), and cannot attach or detach them inside a transaction.
+# The files are merged in groups, with one transaction per group.
+attach_limit = 10
+
+for start in tqdm(range(0, len(db_files), attach_limit)):
+    group = db_files[start : start + attach_limit]
+    for i, db_file in enumerate(group):
+        DB_Handler(db_path=db_file).close()
+        cursor.execute(f"ATTACH DATABASE '{db_file}' AS toMerge{i}")
+    cursor.execute("BEGIN")
+    cursor.execute(
+        "INSERT INTO results_table "
+        + " UNION ALL ".join(
+            f"SELECT * FROM toMerge{i}.results_table" for i in range(len(group))
+        )
+    )
+    cursor.execute("COMMIT")
+    for i in range(len(group)):
+        cursor.execute(f"DETACH DATABASE toMerge{i}")
+    for db_file in group:
+        os.remove(db_file)
 
 # Close the connection to the main database
 conn.close()
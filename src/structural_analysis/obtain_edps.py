@@ -5,7 +5,12 @@ relevant EDPs
 
 import os
 import pickle
+import sqlite3
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from tqdm import tqdm
 from extra.structural_analysis.src.db import DB_Handler
 
@@ -26,6 +31,70 @@ def status_from_log(logfile: str) -> str:
     return 'unknown'
 
 
+@lru_cache(maxsize=16)
+def _edp_layout(column_tuples):
+    """
+    Column masks and output index of `obtain_edps` for the given
+    result columns. All results of an archetype share their columns,
+    so these are computed once and reused.
+
+    Returns
+    -------
+    tuple
+        Mask of the columns whose peak is an EDP, mask of the
+        interstory drift columns, mask of the acceleration EDPs
+        among the peaks, and the index of the EDPs.
+    """
+    columns = pd.MultiIndex.from_tuples(column_tuples)
+    edp_types = columns.get_level_values(0)
+    peak_mask = ~edp_types.isin(['Rtime', 'Subdiv', 'Vb'])
+    id_mask = edp_types == 'ID'
+    peak_columns = columns[peak_mask]
+    rid_columns = columns[id_mask]
+    fa_mask = peak_columns.get_level_values(0) == 'FA'
+
+    index = pd.MultiIndex.from_arrays(
+        [
+            np.concatenate(
+                (
+                    'P' + peak_columns.get_level_values(0),
+                    np.full(len(rid_columns), 'RID', dtype=object),
+                )
+            ),
+            np.concatenate(
+                (
+                    peak_columns.get_level_values(1),
+                    rid_columns.get_level_values(1),
+                )
+            ),
+            np.concatenate(
+                (
+                    peak_columns.get_level_values(2),
+                    rid_columns.get_level_values(2),
+                )
+            ),
+        ]
+    )
+    return peak_mask, id_mask, fa_mask, index
+
+
+@lru_cache(maxsize=16)
+def _table_layout(schema):
+    """
+    Result columns of a dataframe stored as an Arrow table, and the
+    names of the table fields holding them (the remaining fields hold
+    the index).
+    """
+    index_fields = {
+        name
+        for name in schema.pandas_metadata['index_columns']
+        if isinstance(name, str)
+    }
+    data_fields = [name for name in schema.names if name not in index_fields]
+    column_tuples = tuple(schema.empty_table().to_pandas().columns)
+    return column_tuples, data_fields
+
+
 def obtain_edps(dataframe):
     """
     Extracts the EDPs from a dataframe containing the full
@@ -34,8 +103,10 @@ def obtain_edps(dataframe):
 
     Parameters
     ----------
-    dataframe: pd.DataFrame
-        Dataframe containing the full time-hisotyr analysis results.
+    dataframe: pd.DataFrame or pa.Table
+        Dataframe containing the full time-hisotyr analysis results,
+        or the Arrow table it was stored as, which is read without
+        converting it to pandas.
 
     Returns
     -------
@@ -43,27 +114,78 @@ def obtain_edps(dataframe):
         Dataframe containing the EDPs
 
     """
-    edps = dataframe.abs().max().drop(['Rtime', 'Subdiv', 'Vb'])
-    edps['FA'] /= 386.22
-    edps.index = pd.MultiIndex.from_tuples(
-        [(f'P{x[0]}', x[1], x[2]) for x in edps.index]
-    )
-    rid = dataframe.iloc[-1, :]['ID'].abs()
-    rid.index = pd.MultiIndex.from_tuples([('RID', x[0], x[1]) for x in rid.index])
-    edps = pd.concat((edps, rid), axis=0)
-    return edps
+    if isinstance(dataframe, pa.Table):
+        column_tuples, data_fields = _table_layout(dataframe.schema)
+        values = np.column_stack(
+            [dataframe.column(name).to_numpy() for name in data_fields]
+        ).astype(float, copy=False)
+    else:
+        column_tuples = tuple(dataframe.columns)
+        values = dataframe.to_numpy(dtype=float)
+    peak_mask, id_mask, fa_mask, index = _edp_layout(column_tuples)
+
+    # (fmax skips missing values, like DataFrame.max)
+    peaks = np.fmax.reduce(np.abs(values[:, peak_mask]), axis=0)
+    peaks[fa_mask] /= 386.22
+    rids = np.abs(values[-1, id_mask])
+
+    return pd.Series(np.concatenate((peaks, rids)), index=index)
+
+
+# Source database of the worker processes, opened once per process by
+# `init_worker`.
+_worker_db_handler = None
+
+
+def init_worker(db_path):
+    """
+    Open the source database in a worker process.
+    """
+    global _worker_db_handler  # pylint: disable=global-statement
+    _worker_db_handler = DB_Handler(db_path=db_path)
+
+
+def process_identifier(identifier):
+    """
+    Retrieve the results of an analysis from the source database of
+    the worker and extract its EDPs if the analysis finished.
+
+    Returns
+    -------
+    tuple
+        The analysis status, the identifier, and the EDPs (None if
+        the analysis did not finish).
+    """
+    # The log is checked first, so that the results of analyses that
+    # did not finish are never read.
+    status = status_from_log(_worker_db_handler.retrieve_log(identifier))
+    if status != 'finished':
+        return status, identifier, None
+    # (the results are read as an Arrow table, since only a few
+    # reductions over the columns are needed)
+    dataframe, _, _ = _worker_db_handler.retrieve_data(identifier, as_arrow=True)
+    return status, identifier, obtain_edps(dataframe)
 
 
 def main():
 
-    issue_dict_path = 'extra/structural_analysis/results/edps_issue.pickle'
-    if not os.path.isfile(issue_dict_path):
-        issue = []
-        with open(issue_dict_path, 'wb') as f:
-            pickle.dump(issue, f)
-    else:
-        with open(issue_dict_path, 'rb') as f:
-            issue = pickle.load(f)
+    # records that could not be processed are appended to a table
+    # instead of rewriting a pickled list on every run
+    issue_conn = sqlite3.connect('extra/structural_analysis/results/edps_issue.sqlite')
+    issue_conn.execute(
+        'CREATE TABLE IF NOT EXISTS issues (status TEXT, identifier TEXT)'
+    )
+    # import the issues recorded by earlier runs in a pickled list,
+    # once, while the table is still empty
+    issue_pickle_path = 'extra/structural_analysis/results/edps_issue.pickle'
+    if (
+        os.path.isfile(issue_pickle_path)
+        and not issue_conn.execute('SELECT EXISTS(SELECT 1 FROM issues)').fetchone()[0]
+    ):
+        with open(issue_pickle_path, 'rb') as f:
+            previous_issues = pickle.load(f)
+        with issue_conn:
+            issue_conn.executemany('INSERT INTO issues VALUES (?, ?)', previous_issues)
 
     database_paths = [
         'extra/structural_analysis/results/results_1.sqlite',
@@ -83,34 +205,46 @@ def main():
         'extra/structural_analysis/results/results_15.sqlite',
     ]
 
-    result_db_handler = DB_Handler(
-        db_path='extra/structural_analysis/results/edps.sqlite'
-    )
-    processed_identifiers = set(result_db_handler.list_identifiers())
-
-    already_processed = []
+    result_db_path = 'extra/structural_analysis/results/edps.sqlite'
+    # Only the EDP database is created and owned by this host, so only
+    # it uses WAL. The source databases are written by the analysis
+    # tasks from several nodes and keep the rollback journal.
+    result_db_handler = DB_Handler(db_path=result_db_path, wal=True)
+    store_batch_size = 500
 
     for i, path in enumerate(database_paths):
         print(f'Processing path {i + 1} out of {len(database_paths)}.', flush=True)
         db_handler = DB_Handler(db_path=path)
-        identifiers = db_handler.list_identifiers()
-
-        for identifier in tqdm(identifiers):
-            if identifier in processed_identifiers:
-                already_processed.append(identifier)
-                continue
-
-            dataframe, _, log_content = db_handler.retrieve_data(identifier)
-            status = status_from_log(log_content)
-            if status == 'finished':
-                edps = obtain_edps(dataframe)
-                result_db_handler.store_data(identifier, edps, '', '')
-            else:
-                issue.append((status, identifier))
-                db_handler.delete_record(identifier)
-
-    with open(issue_dict_path, 'wb') as f:
-        pickle.dump(issue, f)
+        # records that already have EDPs are skipped
+        pending = db_handler.list_identifiers_not_in(result_db_path)
+
+        # The records are read and reduced in worker processes, each
+        # with its own connection to the source database. Results are
+        # written (and failed records deleted) by this process only,
+        # in batches of one transaction each.
+        to_store = []
+        issue = []
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=init_worker, initargs=(path,)
+        ) as executor:
+            for status, identifier, edps in tqdm(
+                executor.map(process_identifier, pending, chunksize=32),
+                total=len(pending),
+            ):
+                if status == 'finished':
+                    to_store.append((identifier, edps, '', ''))
+                    if len(to_store) >= store_batch_size:
+                        result_db_handler.store_data_bulk(to_store)
+                        to_store = []
+                else:
+                    issue.append((status, identifier))
+        result_db_handler.store_data_bulk(to_store)
+        # issues are recorded before the records are deleted
+        with issue_conn:
+            issue_conn.executemany('INSERT INTO issues VALUES (?, ?)', issue)
+        db_handler.delete_records([identifier for _, identifier in issue])
+
+    issue_conn.close()
 
 
 if __name__ == '__main__':
@@ -271,13 +271,6 @@ def main():
 
     # store response quantities
 
-    df = pd.DataFrame()
-    df["time--"] = np.array(nlth.time_vector)
-
-    df["Rtime--"] = np.array(nlth.results[loadcase.name].clock)
-    df["Rtime--"] -= df["Rtime--"].iloc[0]
-    df["Subdiv--"] = np.array(nlth.results[loadcase.name].subdivision_level)
-
     if direction == "x":
         j = 1
     elif direction == "y":
@@ -285,27 +278,49 @@ def main():
     else:
         raise ValueError(f"Invalid direction: {direction}")
 
-    for lvl in range(num_levels + 1):
-        df[f"FA-{lvl}-{j}"] = nlth.retrieve_node_abs_acceleration(
-            lvl_nodes[lvl], loadcase.name
-        ).loc[:, "abs ax"]
-        df[f"FV-{lvl}-{j}"] = nlth.retrieve_node_abs_velocity(
-            lvl_nodes[lvl], loadcase.name
-        ).loc[:, "abs vx"]
-        if lvl > 0:
-            us = nlth.retrieve_node_displacement(lvl_nodes[lvl], loadcase.name).loc[
-                :, "ux"
-            ]
-            if lvl == 1:
-                dr = us / level_heights[lvl - 1]
-            else:
-                us_prev = nlth.retrieve_node_displacement(
-                    lvl_nodes[lvl - 1], loadcase.name
-                ).loc[:, "ux"]
-                dr = (us - us_prev) / level_heights[lvl - 1]
-            df[f"ID-{lvl}-{j}"] = dr
-
-    df[f"Vb-0-{j}"] = nlth.retrieve_base_shear(loadcase.name)[:, 0]
+    # response histories with one column per level
+    accelerations = np.column_stack(
+        [
+            nlth.retrieve_node_abs_acceleration(node, loadcase.name).loc[:, "abs ax"]
+            for node in lvl_nodes
+        ]
+    )
+    velocities = np.column_stack(
+        [
+            nlth.retrieve_node_abs_velocity(node, loadcase.name).loc[:, "abs vx"]
+            for node in lvl_nodes
+        ]
+    )
+    displacements = np.column_stack(
+        [
+            nlth.retrieve_node_displacement(node, loadcase.name).loc[:, "ux"]
+            for node in lvl_nodes[1:]
+        ]
+    )
+    # (the base does not move)
+    drifts = np.diff(displacements, axis=1, prepend=0.0) / level_heights
+
+    clock = np.array(nlth.results[loadcase.name].clock)
+    df = pd.DataFrame(
+        np.column_stack(
+            (
+                np.array(nlth.time_vector),
+                clock - clock[0],
+                np.array(nlth.results[loadcase.name].subdivision_level),
+                accelerations,
+                velocities,
+                drifts,
+                nlth.retrieve_base_shear(loadcase.name)[:, 0],
+            )
+        ),
+        columns=(
+            ["time--", "Rtime--", "Subdiv--"]
+            + [f"FA-{lvl}-{j}" for lvl in range(num_levels + 1)]
+            + [f"FV-{lvl}-{j}" for lvl in range(num_levels + 1)]
+            + [f"ID-{lvl}-{j}" for lvl in range(1, num_levels + 1)]
+            + [f"Vb-0-{j}"]
+        ),
+    )
 
     df.columns = pd.MultiIndex.from_tuples([x.split("-") for x in df.columns.to_list()])
     df.sort_index(axis=1, inplace=True)
@@ -318,10 +333,16 @@ def main():
     # and set index to `time`
     step = 0.01
     new_index = np.arange(df.index.min(), df.index.max() + step, step)
-    df_resampled = pd.DataFrame(index=new_index, columns=df.columns)
-    df_resampled.index.name = df.index.name
-    for col in df.columns:
-        df_resampled[col] = np.interp(new_index, df.index.values, df[col].values)
+    time_vals = df.index.to_numpy()
+    values = df.to_numpy(dtype=float)
+    resampled = np.empty((len(new_index), values.shape[1]))
+    for k in range(values.shape[1]):
+        resampled[:, k] = np.interp(new_index, time_vals, values[:, k])
+    df_resampled = pd.DataFrame(
+        resampled,
+        index=pd.Index(new_index, name=df.index.name),
+        columns=df.columns,
+    )
 
     # add the results to the database
     if not os.path.isdir(f'extra/structural_analysis/results/{sub_path}'):
@@ -3,48 +3,62 @@ Utility functions
 """
 
 import os
+from functools import lru_cache
 from io import StringIO
 from glob2 import glob
 import numpy as np
 import pandas as pd
-from scipy.interpolate import interp1d
 
 
-def retrieve_peer_gm_data(rsn, out_type="filenames"):
+# Parsed `_SearchResults.csv` contents are cached for the lifetime of
+# the process, since they are looked up once per record by several
+# scripts. The returned dataframes are shared and must not be
+# modified in place.
+
+
+@lru_cache(maxsize=1)
+def find_peer_search_results():
     """
-    Searches all available `_SearchResults.csv` for a given RSN,
-    identifies the right folder and retrieves the unscaled RotD50
-    response spectrum or the ground motion filenames.
+    Finds all available PEER `_SearchResults.csv` files.
 
     """
+    return tuple(
+        glob('extra/structural_analysis/data/ground_motions/*/*/_SearchResults.csv')
+    )
 
-    def get_gm_data(search_results_file):
-        """
-        Helper function that reads certain contents from a PEER
-        `_SearchResults.csv` file.
 
-        """
-        with open(search_results_file, "r", encoding="utf-8") as f:
-            contents = f.read()
+@lru_cache(maxsize=None)
+def read_peer_gm_metadata(search_results_file):
+    """
+    Reads the record metadata section of a PEER `_SearchResults.csv`
+    file, indexed by RSN.
 
-        contents = contents.split(" -- Summary of Metadata of Selected Records --")[
-            1
-        ].split("\n\n")[0]
-        data = StringIO(contents)
+    """
+    with open(search_results_file, "r", encoding="utf-8") as f:
+        contents = f.read()
 
-        df = pd.read_csv(data, index_col=2)
+    contents = contents.split(" -- Summary of Metadata of Selected Records --")[
+        1
+    ].split("\n\n")[0]
+    data = StringIO(contents)
 
-        return df
+    df = pd.read_csv(data, index_col=2)
 
-    # Find all `_SearchResults.csv` files
-    files = glob(
-        'extra/structural_analysis/data/ground_motions/*/*/_SearchResults.csv'
-    )
+    return df
+
+
+def retrieve_peer_gm_data(rsn, out_type="filenames"):
+    """
+    Searches all available `_SearchResults.csv` for a given RSN,
+    identifies the right folder and retrieves the unscaled RotD50
+    response spectrum or the ground motion filenames.
+
+    """
 
     # Identify the one containing the specified `rsn`
     identified_file = None
-    for file_path in files:
-        data = get_gm_data(file_path)
+    for file_path in find_peer_search_results():
+        data = read_peer_gm_metadata(file_path)
         if rsn in data.index:
             identified_file = file_path
             break
@@ -55,7 +69,7 @@ def retrieve_peer_gm_data(rsn, out_type="filenames"):
     rootdir = os.path.dirname(identified_file)
 
     if out_type == "filenames":
-        df = get_gm_data(identified_file)
+        df = read_peer_gm_metadata(identified_file)
 
         filenames = df.loc[
             rsn,
@@ -76,33 +90,45 @@ def retrieve_peer_gm_data(rsn, out_type="filenames"):
         return result
 
     if out_type == "spectrum":
-        with open(identified_file, "r", encoding="utf-8") as f:
-            contents = f.read()
-
-        contents = contents.split(" -- Scaled Spectra used in Search & Scaling --")[
-            1
-        ].split("\n\n")[0]
-        data = StringIO(contents)
-
-        df = pd.read_csv(data, index_col=0)
-        # drop stats columns
-        df = df.drop(
-            columns=[
-                "Arithmetic Mean pSa (g)",
-                "Arithmetic Mean + Sigma pSa (g)",
-                "Arithmetic Mean - Sigma pSa (g)",
-            ]
-        )
-        df.columns = [x.split(" ")[0].split("-")[1] for x in df.columns]
-        df.columns.name = "RSN"
-        df.columns = df.columns.astype(int)
-        df.index.name = "T"
-
-        return df[rsn]
+        df = read_peer_gm_spectra(identified_file)
+
+        return df[rsn].copy()
 
     raise ValueError("Unsupported out_type: {out_type}")
 
 
+@lru_cache(maxsize=None)
+def read_peer_gm_spectra(search_results_file):
+    """
+    Reads the unscaled RotD50 response spectra of all records in a
+    PEER `_SearchResults.csv` file, with one column per RSN.
+
+    """
+    with open(search_results_file, "r", encoding="utf-8") as f:
+        contents = f.read()
+
+    contents = contents.split(" -- Scaled Spectra used in Search & Scaling --")[
+        1
+    ].split("\n\n")[0]
+    data = StringIO(contents)
+
+    df = pd.read_csv(data, index_col=0)
+    # drop stats columns
+    df = df.drop(
+        columns=[
+            "Arithmetic Mean pSa (g)",
+            "Arithmetic Mean + Sigma pSa (g)",
+            "Arithmetic Mean - Sigma pSa (g)",
+        ]
+    )
+    df.columns = [x.split(" ")[0].split("-")[1] for x in df.columns]
+    df.columns.name = "RSN"
+    df.columns = df.columns.astype(int)
+    df.index.name = "T"
+
+    return df
+
+
 def retrieve_peer_gm_spectra(rsns):
     """
     Uses retrieve_peer_gm_data to prepare a dataframe with response
@@ -118,17 +144,32 @@ def retrieve_peer_gm_spectra(rsns):
     return df
 
 
+def _interp_linear_extrapolate(x, xp, fp):
+    """
+    Piecewise linear interpolation that extrapolates linearly beyond
+    the first and last points, equivalent to `interp1d` with
+    `kind='linear'` and `fill_value='extrapolate'` without
+    constructing an interpolator object.
+    """
+    if np.any(xp[1:] < xp[:-1]):
+        order = np.argsort(xp, kind='stable')
+        xp = xp[order]
+        fp = fp[order]
+    i = np.clip(np.searchsorted(xp, x) - 1, 0, len(xp) - 2)
+    slope = (fp[i + 1] - fp[i]) / (xp[i + 1] - xp[i])
+    return fp[i] + slope * (x - xp[i])
+
+
 def interpolate_pd_series(series, values):
     """
     Interpolates a pandas series for specified index values.
     """
-    idx_vec = series.index.to_numpy()
-    vals_vec = series.to_numpy()
-    ifun = interp1d(idx_vec, vals_vec, kind='linear', fill_value='extrapolate')
+    idx_vec = series.index.to_numpy(dtype=float)
+    vals_vec = series.to_numpy(dtype=float)
     if isinstance(values, float):
-        return float(ifun(values))
+        return float(_interp_linear_extrapolate(np.array(values), idx_vec, vals_vec))
     if isinstance(values, np.ndarray):
-        return ifun(values)
+        return _interp_linear_extrapolate(values, idx_vec, vals_vec)
     return ValueError(f"Invalid datatype: {type(values)}")
 
 
@@ -145,6 +186,25 @@ def file_exists(file_path):
     return os.path.exists(file_path) and os.path.isfile(file_path)
 
 
+def binary_copy_is_current(binary_path, text_path):
+    """
+    Checks if a binary copy of a text output file exists and is at
+    least as recent as the text file, so that it can be read instead.
+
+    Args:
+        binary_path (str): The path to the binary copy.
+        text_path (str): The path to the text file.
+
+    Returns:
+        bool: True if the binary copy can be used, False otherwise.
+    """
+    if not os.path.isfile(binary_path):
+        return False
+    return not os.path.isfile(text_path) or (
+        os.path.getmtime(binary_path) >= os.path.getmtime(text_path)
+    )
+
+
 def check_last_line(file_path, target_string):
     """
     Checks if the last line of a file contains a specific string.